@@ -0,0 +1,105 @@
+"""
+Декодирование ответа /widget/v3/devices: прежний путь
+(text -> json.loads -> фильтр -> model_validate) против decode_account
+и AccountDecoder: без кэша, когда изменились все устройства и когда
+не изменилось ни одно.
+
+    python -m benchmarks.bench_decode --devices 200 --sensors 100
+    python -m benchmarks.bench_decode --payload recorded_devices.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from custom_components.zont_ha.core.decode import (
+    AccountDecoder, decode_account
+)
+from custom_components.zont_ha.core.models_zont_v3 import AccountZont
+from .payloads import make_account
+
+
+def legacy_decode(body: bytes, selected: list[str]) -> AccountZont:
+    data_json = json.loads(body.decode())
+    devices = data_json.get('devices')
+    actual_devices = [
+        device for device in devices if str(device.get('id')) in selected
+    ]
+    data_json.update({'devices': actual_devices})
+    return AccountZont.model_validate(data_json)
+
+
+def change_all_devices(account: dict) -> bytes:
+    """Тот же ответ, в котором у каждого устройства изменён один сенсор."""
+    for device in account['devices']:
+        for sensor in device['sensors'][:1]:
+            sensor['value'] = (sensor.get('value') or 0) + 1
+    return json.dumps(account, ensure_ascii=False).encode()
+
+
+def measure(func, repeat: int) -> tuple[float, float]:
+    """CPU-время одного вызова (мс) и пик выделенной памяти (МБ)."""
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    cpu = (time.process_time() - start) / repeat
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu * 1000, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--payload', help='записанный ответ API V3')
+    parser.add_argument('--devices', type=int, default=100)
+    parser.add_argument('--sensors', type=int, default=50)
+    parser.add_argument('--selected', type=float, default=1.0,
+                        help='доля выбранных устройств')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, 'rb') as file:
+            body = file.read()
+        account = json.loads(body)
+    else:
+        account = make_account(args.devices, args.sensors)
+        body = json.dumps(account, ensure_ascii=False).encode()
+    changed = change_all_devices(account)
+    ids = [str(device['id']) for device in json.loads(body)['devices']]
+    selected = ids[:max(1, int(len(ids) * args.selected))]
+    selected_set = set(selected)
+    decoder = AccountDecoder()
+
+    def cold():
+        decoder.invalidate()
+        decoder.decode(body, selected_set)
+
+    def all_changed():
+        decoder.decode(changed, selected_set)
+        decoder.decode(body, selected_set)
+
+    def warm():
+        decoder.decode(body, selected_set)
+
+    print(f'payload={len(body) / 2 ** 10:.0f} KiB devices={len(ids)} '
+          f'selected={len(selected)}')
+    for name, func in (
+            ('legacy', lambda: legacy_decode(body, selected)),
+            ('decode_account', lambda: decode_account(body, selected_set)),
+            ('decoder (cold)', cold),
+            ('decoder (all changed)', all_changed),
+            ('decoder (warm)', warm),
+    ):
+        decoder.decode(body, selected_set)
+        cpu, peak = measure(func, args.repeat)
+        if func is all_changed:
+            # Два разбора за вызов: туда и обратно.
+            cpu /= 2
+        print(f'{name:>21}: cpu {cpu:8.2f} ms, peak {peak:7.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Стоимость раздачи обновления сущностям: поиск объектов по спискам
+против индексов снимка аккаунта.
+
+    python -m benchmarks.bench_index --devices 100 --sensors 100
+"""
+import argparse
+import timeit
+
+from custom_components.zont_ha.core.index import AccountIndex
+from custom_components.zont_ha.core.models_zont_v3 import AccountZont
+from custom_components.zont_ha.core.zont import Zont
+from .payloads import make_account
+
+
+def linear_get_device(account, device_id):
+    return next(
+        (device for device in account.devices if device.id == device_id),
+        None
+    )
+
+
+def linear_fan_out(account, entities):
+    for device_id, kind, object_id in entities:
+        device = linear_get_device(account, device_id)
+        next((item for item in getattr(device, kind)
+              if item.id == object_id), None)
+
+
+def indexed_fan_out(zont, entities):
+    for device_id, kind, object_id in entities:
+        if kind == 'sensors':
+            zont.get_sensor(device_id, object_id)
+        elif kind == 'circuits':
+            zont.find_circuit(device_id, object_id)
+        else:
+            zont.find_guard_zone(device_id, object_id)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--devices', type=int, default=50)
+    parser.add_argument('--sensors', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    account = AccountZont.model_validate(
+        make_account(args.devices, args.sensors)
+    )
+    entities = [
+        (device.id, kind, item.id)
+        for device in account.devices
+        for kind in ('sensors', 'circuits', 'guard_zones')
+        for item in getattr(device, kind)
+    ]
+    zont = object.__new__(Zont)
+    zont.data = account
+
+    build = timeit.timeit(
+        lambda: AccountIndex(account), number=args.repeat) / args.repeat
+    zont.index = AccountIndex(account)
+    linear = timeit.timeit(
+        lambda: linear_fan_out(account, entities),
+        number=args.repeat) / args.repeat
+    indexed = timeit.timeit(
+        lambda: indexed_fan_out(zont, entities),
+        number=args.repeat) / args.repeat
+
+    print(f'devices={args.devices} entities={len(entities)}')
+    print(f'linear fan-out:  {linear * 1000:9.3f} ms')
+    print(f'indexed fan-out: {indexed * 1000:9.3f} ms '
+          f'(+ index build {build * 1000:.3f} ms)')
+
+
+if __name__ == '__main__':
+    main()
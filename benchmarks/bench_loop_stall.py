@@ -0,0 +1,76 @@
+"""
+Блокировка event loop при разборе ответа /widget/v3/devices: разбор
+в event loop против разбора в потоке исполнителя.
+Пока идут опросы, фоновая задача каждые --tick секунд замеряет,
+на сколько позже срока она проснулась.
+
+    python -m benchmarks.bench_loop_stall --devices 200 --sensors 100
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import ClientSession
+
+from custom_components.zont_ha.core.zont import Zont
+from .mock_api import MockZontApi
+
+
+async def watch_loop(tick: float, stalls: list[float]) -> None:
+    """Записывает опоздания пробуждений относительно tick, с."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(tick)
+        stalls.append(max(0.0, time.perf_counter() - start - tick))
+
+
+async def measure(
+        api_url_root: str, executor_threshold: int, args
+) -> tuple[float, float, float]:
+    stalls: list[float] = []
+    async with ClientSession() as session:
+        zont = Zont(
+            None, 'bench@example.com', 'token', session=session,
+            api_url_root=api_url_root, executor_threshold=executor_threshold
+        )
+        zont.limiter.rate = zont.limiter.capacity = 1000
+        watcher = asyncio.create_task(watch_loop(args.tick, stalls))
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            # Без кэша отпечатков: каждый опрос валидирует все устройства.
+            zont.decoder.invalidate()
+            zont.mark_stale()
+            await zont.get_update()
+        elapsed = (time.perf_counter() - start) / args.repeat
+        watcher.cancel()
+    return elapsed, max(stalls, default=0), sum(stalls)
+
+
+async def run(args) -> None:
+    api = MockZontApi(args.devices, args.sensors, 0)
+    api_url_root = await api.start()
+    try:
+        for name, threshold in (('inline', 2 ** 62), ('executor', 0)):
+            elapsed, worst, total = await measure(
+                api_url_root, threshold, args
+            )
+            print(f'{name:8}: poll {elapsed * 1000:8.1f} ms, '
+                  f'max stall {worst * 1000:8.1f} ms, '
+                  f'total stall {total * 1000:9.1f} ms')
+        requests = sum(api.requests.values())
+        print(f'payload: {api.bytes_raw / requests / 1024:.0f} KB')
+    finally:
+        await api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--devices', type=int, default=100)
+    parser.add_argument('--sensors', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--tick', type=float, default=0.001)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Масштабирование интеграции с размером аккаунта: от 1 до 500
+контроллеров и до 200 датчиков на каждом.
+Для каждого размера замеряются:
+  get_update_cold  - первый опрос (разбор, валидация, производные
+                     сенсоры, индекс);
+  get_update_warm  - повторный опрос, изменился один контроллер;
+  create_sensors   - производные сенсоры для всех контроллеров;
+  accessors        - все методы поиска Zont по всем объектам;
+  fan_out_full     - _handle_coordinator_update всех сущностей всех
+                     платформ при полном обновлении;
+  fan_out_delta    - то же после опроса с одним изменённым контроллером.
+Запись состояния в Home Assistant (async_write_ha_state) не входит
+в замер. Для каждого этапа выводятся время, пик выделенной памяти
+(tracemalloc), для размера в целом - пиковый RSS процесса: каждый
+размер считается в отдельном процессе.
+Результаты сравниваются с baseline_scale.json. Базовые значения
+зависят от машины: перезаписывайте их (--save-baseline) там же,
+где затем сравниваете.
+
+    python -m benchmarks.bench_scale
+    python -m benchmarks.bench_scale --sizes 1x20,500x200 --save-baseline
+    python -m benchmarks.bench_scale --check --tolerance 0.25
+"""
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydantic_core import from_json
+
+from custom_components.zont_ha.const import BINARY_SENSOR_TYPES
+from custom_components.zont_ha.core.delta import ChangeSet
+from custom_components.zont_ha.core.models_zont_v1 import AccountZontOld
+from custom_components.zont_ha.core.models_zont_v3 import DeviceZONT
+from custom_components.zont_ha.core.ratelimit import TokenBucket
+from custom_components.zont_ha.core.zont import Zont
+from .payloads import make_account_old, make_large_account
+
+BASELINE = Path(__file__).with_name('baseline_scale.json')
+SIZES = '1x20,10x50,50x100,200x100,500x200'
+
+
+class PayloadResponse:
+    def __init__(self, body: bytes) -> None:
+        self.status = 200
+        self.headers = {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class PayloadSession:
+    """Сессия, отдающая заданный ответ V3 без сети."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    async def request(self, method: str, **kwargs) -> PayloadResponse:
+        return PayloadResponse(self.body)
+
+
+def make_zont(body: bytes, devices: int) -> Zont:
+    zont = Zont(
+        None, 'bench@example.com', 'token', session=PayloadSession(body),
+        limiter=TokenBucket(10 ** 9, 10 ** 9), executor_threshold=2 ** 62
+    )
+    zont._set_data_old(
+        AccountZontOld.model_validate(make_account_old(devices)), None
+    )
+    return zont
+
+
+def change_one_device(account: dict) -> bytes:
+    """Ответ, в котором изменился один датчик первого контроллера."""
+    sensor = account['devices'][0]['sensors'][0]
+    sensor['value'] = (sensor['value'] or 0) + 1
+    return json.dumps(account).encode()
+
+
+def sensor_entity(zont, device_id, object_id):
+    return zont.get_sensor(device_id, object_id).value
+
+
+def binary_sensor_entity(zont, device_id, object_id):
+    return zont.get_sensor(device_id, object_id).triggered
+
+
+def online_entity(zont, device_id, object_id):
+    return zont.get_device(device_id).online
+
+
+def status_entity(zont, device_id, object_id):
+    return zont.get_status_control(device_id, object_id).active
+
+
+def switch_entity(zont, device_id, object_id):
+    return zont.get_toggle_button(device_id, object_id).active
+
+
+def climate_entity(zont, device_id, object_id):
+    device = zont.get_device(device_id)
+    circuit = zont.find_circuit(device_id, object_id)
+    zont.get_min_max_values_temp(circuit)
+    zont.get_names_heating_mode(device.modes, circuit)
+    return zont.find_heating_mode_by_id(device_id, circuit.current_mode)
+
+
+def alarm_entity(zont, device_id, object_id):
+    return zont.get_state_guard_zone_for_ha(
+        zont.find_guard_zone(device_id, object_id)
+    )
+
+
+def button_entity(zont, device_id, object_id):
+    return None
+
+
+def tracker_entity(zont, device_id, object_id):
+    return zont.get_device_old(device_id)
+
+
+def build_entities(zont: Zont) -> list[tuple]:
+    """Сущности всех платформ, как их создаёт async_setup_entry."""
+    entities = []
+    for device in zont.data.devices:
+        device_id = device.id
+        entities.append((online_entity, device_id, None))
+        entities.append((tracker_entity, device_id, None))
+        for sensor in device.sensors:
+            handler = (binary_sensor_entity
+                       if sensor.type.value in BINARY_SENSOR_TYPES
+                       else sensor_entity)
+            entities.append((handler, device_id, sensor.id))
+        for circuit in device.circuits:
+            entities.append((climate_entity, device_id, circuit.id))
+        for guard_zone in device.guard_zones:
+            entities.append((alarm_entity, device_id, guard_zone.id))
+        for mode in device.modes:
+            entities.append((button_entity, device_id, None))
+        controls = device.controls
+        for status in controls.statuses:
+            entities.append((status_entity, device_id, status.id))
+        for toggle_button in controls.toggle_buttons:
+            entities.append((switch_entity, device_id, toggle_button.id))
+        for button in controls.buttons:
+            entities.append((button_entity, device_id, None))
+    return entities
+
+
+def fan_out(zont: Zont, entities: list[tuple], changes: ChangeSet | None):
+    """Раздача обновления сущностям, как в ZontCoordinator.is_changed."""
+    for handler, device_id, object_id in entities:
+        if changes is None or changes.is_changed(device_id, object_id):
+            handler(zont, device_id, object_id)
+
+
+def call_accessors(zont: Zont) -> None:
+    index = zont.index
+    for device_id, device in index.devices.items():
+        zont.get_device(device_id)
+        zont.get_device_old(device_id)
+        for circuit in device.circuits:
+            zont.get_circuit(device, circuit.id)
+            zont.find_circuit(device_id, circuit.id)
+            zont.get_min_max_values_temp(circuit)
+            zont.get_names_heating_mode(device.modes, circuit)
+        for mode in device.modes:
+            zont.get_heating_mode_by_id(device, mode.id)
+            zont.get_heating_mode_by_name(device, mode.name)
+            zont.find_heating_mode_by_id(device_id, mode.id)
+            zont.find_heating_mode_by_name(device_id, mode.name)
+        for guard_zone in device.guard_zones:
+            zont.get_state_guard_zone_for_ha(
+                zont.get_guard_zone(device, guard_zone.id)
+            )
+            zont.find_guard_zone(device_id, guard_zone.id)
+    for device_id, sensor_id in index.sensors:
+        zont.get_sensor(device_id, sensor_id)
+    for device_id, status_id in index.statuses:
+        zont.get_status_control(device_id, status_id)
+    for device_id, button_id in index.toggle_buttons:
+        zont.get_toggle_button(device_id, button_id)
+    zont.has_guard_transition()
+
+
+async def measure(stage, setup=None, repeat: int = 3) -> dict[str, float]:
+    """
+    Среднее время этапа (мс) и пик памяти одного прогона (МБ).
+    setup() готовит аргумент этапа и в замер не входит.
+    """
+    total = 0.0
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = stage(arg)
+        if asyncio.iscoroutine(result):
+            await result
+        total += time.perf_counter() - start
+    arg = setup() if setup else None
+    tracemalloc.start()
+    result = stage(arg)
+    if asyncio.iscoroutine(result):
+        await result
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'wall_ms': round(total / repeat * 1000, 3),
+        'alloc_mb': round(peak / 2 ** 20, 3),
+    }
+
+
+async def run_size(devices: int, sensors: int, repeat: int) -> dict:
+    account = make_large_account(devices, sensors)
+    body = json.dumps(account).encode()
+    body_changed = change_one_device(account)
+    results = {}
+
+    async def cold(zont):
+        await zont.get_update()
+
+    results['get_update_cold'] = await measure(
+        cold, lambda: make_zont(body, devices), repeat
+    )
+
+    zont = make_zont(body, devices)
+    await zont.get_update()
+    bodies = [body_changed, body]
+
+    async def warm(_):
+        zont.session.body = bodies[0]
+        bodies.reverse()
+        zont.mark_stale()
+        await zont.get_update()
+
+    results['get_update_warm'] = await measure(warm, repeat=repeat)
+    delta = zont.changes
+
+    devices_json = from_json(body)['devices']
+
+    def fresh_devices():
+        zont._synthetic = {}
+        return [DeviceZONT.model_validate(item) for item in devices_json]
+
+    results['create_sensors'] = await measure(
+        zont._create_sensors, fresh_devices, repeat
+    )
+    # Вернуть снимок в согласованное с индексом состояние.
+    zont.mark_stale()
+    await zont.get_update()
+
+    results['accessors'] = await measure(
+        lambda _: call_accessors(zont), repeat=repeat
+    )
+    entities = build_entities(zont)
+    results['fan_out_full'] = await measure(
+        lambda _: fan_out(zont, entities, None), repeat=repeat
+    )
+    results['fan_out_delta'] = await measure(
+        lambda _: fan_out(zont, entities, delta), repeat=repeat
+    )
+    return {
+        'payload_mb': round(len(body) / 2 ** 20, 3),
+        'entities': len(entities),
+        'stages': results,
+        'rss_mb': round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def worker(devices: int, sensors: int, repeat: int) -> dict:
+    return asyncio.run(run_size(devices, sensors, repeat))
+
+
+def compare(value: float, base: float | None) -> str:
+    if not base:
+        return ''
+    return f' ({(value - base) / base:+.0%})'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default=SIZES,
+                        help='размеры через запятую: контроллеры x датчики')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true',
+                        help='код 1 при замедлении больше tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    report = {}
+    regressions = []
+    for size in args.sizes.split(','):
+        devices, sensors = (int(value) for value in size.split('x'))
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(
+                worker, devices, sensors, args.repeat
+            ).result()
+        report[size] = result
+        base = baseline.get(size, {})
+        print(f'{size}: payload {result["payload_mb"]} MB, '
+              f'entities {result["entities"]}, '
+              f'peak RSS {result["rss_mb"]} MB'
+              f'{compare(result["rss_mb"], base.get("rss_mb"))}')
+        for stage, values in result['stages'].items():
+            base_stage = base.get('stages', {}).get(stage, {})
+            base_wall = base_stage.get('wall_ms')
+            print(f'  {stage:16} {values["wall_ms"]:10.3f} ms'
+                  f'{compare(values["wall_ms"], base_wall):9} '
+                  f'{values["alloc_mb"]:9.3f} MB'
+                  f'{compare(values["alloc_mb"], base_stage.get("alloc_mb"))}')
+            if (base_wall and values['wall_ms']
+                    > base_wall * (1 + args.tolerance)):
+                regressions.append(f'{size} {stage}')
+
+    if args.save_baseline:
+        baseline.update(report)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f'Базовые значения записаны в {args.baseline}')
+    if regressions:
+        print(f'Замедление больше {args.tolerance:.0%}: '
+              f'{", ".join(regressions)}')
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Опрос /widget/v3/devices через сессию без постоянных соединений и сжатия
+против сессии интеграции (keep-alive, кэш DNS, gzip/brotli).
+
+    python -m benchmarks.bench_session --devices 100 --polls 20
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import ClientSession, TCPConnector
+
+from custom_components.zont_ha.core.ratelimit import TokenBucket
+from custom_components.zont_ha.core.session import create_session
+from custom_components.zont_ha.core.zont import Zont
+from .mock_api import MockZontApi
+
+
+def plain_session() -> ClientSession:
+    """Новое соединение на каждый запрос, ответ без сжатия."""
+    return ClientSession(
+        connector=TCPConnector(force_close=True),
+        headers={'Accept-Encoding': 'identity'},
+    )
+
+
+async def measure(args, make_session) -> dict:
+    api = MockZontApi(args.devices, args.sensors, args.latency)
+    api_url_root = await api.start()
+    try:
+        async with make_session() as session:
+            zont = Zont(
+                None, 'bench@example.com', 'token',
+                session=session, api_url_root=api_url_root,
+                # Ограничитель частоты не должен влиять на замер.
+                limiter=TokenBucket(rate=1000, capacity=1000)
+            )
+            start = time.perf_counter()
+            for _ in range(args.polls):
+                zont.mark_stale()
+                await zont.get_update()
+            elapsed = time.perf_counter() - start
+    finally:
+        await api.close()
+    return {
+        'polls': args.polls,
+        'connections': len(api.connections),
+        'bytes_raw': api.bytes_raw,
+        'bytes_sent': api.bytes_sent,
+        'ms_per_poll': elapsed / args.polls * 1000,
+    }
+
+
+async def run(args) -> None:
+    for name, make_session in (('plain', plain_session),
+                               ('integration', create_session)):
+        result = await measure(args, make_session)
+        saved = 1 - result['bytes_sent'] / result['bytes_raw']
+        print(f'{name:12} polls={result["polls"]} '
+              f'connections={result["connections"]} '
+              f'sent={result["bytes_sent"]} B '
+              f'(saved {saved:.0%} of {result["bytes_raw"]} B) '
+              f'{result["ms_per_poll"]:.1f} ms/poll')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--devices', type=int, default=20)
+    parser.add_argument('--sensors', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--polls', type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Получение данных при запуске записи: последовательные запросы V1 и V3
+(как было в async_setup_entry) против одновременных.
+
+    python -m benchmarks.bench_startup --devices 50 --latency 0.3
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import ClientSession
+
+from custom_components.zont_ha.core.zont import Zont
+from .mock_api import MockZontApi
+
+
+async def sequential(zont: Zont) -> None:
+    await zont.init_old_data()
+    await zont.get_update()
+
+
+async def concurrent(zont: Zont) -> None:
+    await asyncio.gather(zont.init_old_data(), zont.get_update())
+
+
+async def measure(api_url_root: str, startup, repeat: int) -> float:
+    total = 0.0
+    async with ClientSession() as session:
+        for _ in range(repeat):
+            zont = Zont(
+                None, 'bench@example.com', 'token',
+                session=session, api_url_root=api_url_root
+            )
+            start = time.perf_counter()
+            await startup(zont)
+            total += time.perf_counter() - start
+    return total / repeat
+
+
+async def run(args) -> None:
+    api = MockZontApi(args.devices, args.sensors, args.latency)
+    api_url_root = await api.start()
+    try:
+        for name, startup in (('sequential', sequential),
+                              ('concurrent', concurrent)):
+            elapsed = await measure(api_url_root, startup, args.repeat)
+            print(f'{name:10}: {elapsed * 1000:9.1f} ms')
+    finally:
+        await api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--devices', type=int, default=10)
+    parser.add_argument('--sensors', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+"""
+Локальная замена API ZONT для бенчмарков и отладки без сети.
+
+    api = MockZontApi(devices=50, latency=0.2, error_rate=0.05)
+    api_url_root = await api.start()
+    ...
+    await api.close()
+
+Отдельным процессом (например, для Home Assistant с подменённым
+ZONT_API_URL_ROOT):
+
+    python -m benchmarks.mock_api --port 8123 --devices 20 \
+        --webhook-url http://127.0.0.1:8123/api/webhook/<id>
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import time
+
+from aiohttp import ClientError, ClientSession, web
+
+from .payloads import make_account, make_account_old
+
+
+class MockZontApi:
+    """
+    Сервер с состоянием аккаунта ZONT.
+    Отдаёт ответы V1 и V3 и выполняет команды: уставку температуры,
+    режимы (V3 и send_z3k_command), кнопки и охранные зоны. Постановка
+    и снятие охраны проходят через ENABLING/DISABLING и завершаются
+    через guard_delay секунд. Изменения кнопок и охраны отправляются
+    на webhook_url, если он задан. Тип события условный: интеграция
+    на любое событие обновляет данные из API.
+    Задержка ответа - latency плюс случайная добавка до jitter. Доля
+    ответов 500 - error_rate, ответов 429 с Retry-After - throttle_rate.
+    Сжимает ответы gzip по Accept-Encoding и считает соединения и байты.
+    """
+
+    def __init__(
+            self, devices: int = 10, sensors: int = 20, latency: float = 0,
+            *, jitter: float = 0, error_rate: float = 0,
+            throttle_rate: float = 0, guard_delay: float = 1,
+            webhook_url: str | None = None, seed: int | None = None
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.guard_delay = guard_delay
+        self.webhook_url = webhook_url
+        self.random = random.Random(seed)
+        self.account = make_account(devices, sensors)
+        self.body_v1 = json.dumps(make_account_old(devices)).encode()
+        self._body_v3: bytes | None = None
+        self._devices = {
+            device['id']: device for device in self.account['devices']
+        }
+        self.requests: dict[str, int] = {}
+        self.errors: int = 0
+        self.throttled: int = 0
+        self.webhooks: int = 0
+        self.connections: set = set()
+        self.bytes_raw: int = 0
+        self.bytes_sent: int = 0
+        self._gzip_cache: dict[bytes, bytes] = {}
+        self._timers: list[asyncio.TimerHandle] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._session: ClientSession | None = None
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def body_v3(self) -> bytes:
+        """Ответ /widget/v3/devices для текущего состояния."""
+        if self._body_v3 is None:
+            self._body_v3 = json.dumps(self.account).encode()
+        return self._body_v3
+
+    def changed(self) -> None:
+        """Сбрасывает кэш ответа V3 после изменения состояния."""
+        self._body_v3 = None
+        self._gzip_cache.clear()
+
+    def _count(self, name: str, request: web.Request) -> None:
+        self.requests[name] = self.requests.get(name, 0) + 1
+        self.connections.add(request.transport.get_extra_info('peername'))
+
+    async def _delay(self) -> None:
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _failure(self) -> web.Response | None:
+        """Случайный ответ 429 или 500 по заданным долям."""
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            self.throttled += 1
+            return web.json_response(
+                {'ok': False, 'error': 'rate_limit',
+                 'error_ui': 'Слишком много запросов'},
+                status=429, headers={'Retry-After': '1'}
+            )
+        if roll < self.throttle_rate + self.error_rate:
+            self.errors += 1
+            return web.json_response(
+                {'ok': False, 'error': 'internal',
+                 'error_ui': 'Внутренняя ошибка сервера'},
+                status=500
+            )
+        return None
+
+    async def _respond(
+            self, request: web.Request, name: str, body: bytes
+    ) -> web.Response:
+        self._count(name, request)
+        await self._delay()
+        failure = self._failure()
+        if failure is not None:
+            return failure
+        headers = {}
+        self.bytes_raw += len(body)
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            if body not in self._gzip_cache:
+                self._gzip_cache[body] = gzip.compress(body)
+            body = self._gzip_cache[body]
+            headers['Content-Encoding'] = 'gzip'
+        self.bytes_sent += len(body)
+        return web.Response(
+            body=body, headers=headers, content_type='application/json'
+        )
+
+    async def devices_v3(self, request: web.Request) -> web.Response:
+        return await self._respond(request, 'devices_v3', self.body_v3)
+
+    async def devices_v1(self, request: web.Request) -> web.Response:
+        return await self._respond(request, 'devices_v1', self.body_v1)
+
+    async def _command(self, request: web.Request, name: str, apply):
+        """
+        Общая обработка команды: задержка, ошибки, поиск устройства.
+        apply(device, data) меняет состояние и возвращает False, если
+        объект команды не найден.
+        """
+        self._count(name, request)
+        await self._delay()
+        failure = self._failure()
+        if failure is not None:
+            return failure
+        data = await request.json() if request.can_read_body else {}
+        device_id = (data.get('device_id')
+                     or request.match_info.get('device_id'))
+        device = self._devices.get(int(device_id or 0))
+        if device is None or apply(device, data) is False:
+            return web.json_response(
+                {'ok': False, 'error': 'not_found',
+                 'error_ui': 'Объект не найден'},
+                status=404
+            )
+        self.changed()
+        return web.json_response({'ok': True})
+
+    @staticmethod
+    def _find(items: list[dict], object_id) -> dict | None:
+        for item in items:
+            if str(item['id']) == str(object_id):
+                return item
+        return None
+
+    async def target_temp(self, request: web.Request) -> web.Response:
+        def apply(device, data):
+            circuit = self._find(
+                device['circuits'], request.match_info['circuit_id']
+            )
+            if circuit is None:
+                return False
+            circuit['target_temp'] = data['target_temp']
+        return await self._command(request, 'target_temp', apply)
+
+    def _activate_mode(self, device, mode_id, circuit_id=None):
+        mode = self._find(device['modes'], mode_id)
+        if mode is None:
+            return False
+        for circuit in device['circuits']:
+            if circuit_id is None or str(circuit['id']) == str(circuit_id):
+                circuit['current_mode'] = mode['id']
+
+    async def activate_mode(self, request: web.Request) -> web.Response:
+        def apply(device, data):
+            return self._activate_mode(
+                device, request.match_info['mode_id'],
+                data.get('circuit_id')
+            )
+        return await self._command(request, 'activate_mode', apply)
+
+    async def send_z3k_command(self, request: web.Request) -> web.Response:
+        def apply(device, data):
+            if data.get('command_name') != 'SelectHeatingModeForCircuit':
+                return False
+            return self._activate_mode(
+                device, data['command_args']['mode_id'],
+                data.get('object_id')
+            )
+        return await self._command(request, 'send_z3k_command', apply)
+
+    async def trigger(self, request: web.Request) -> web.Response:
+        def apply(device, data):
+            button = self._find(
+                device['controls']['toggle_buttons'],
+                request.match_info['control_id']
+            )
+            if button is None:
+                return False
+            button['active'] = bool(data.get('target_state'))
+            self.post_webhook(
+                device,
+                'control_on' if button['active'] else 'control_off',
+                button['id']
+            )
+        return await self._command(request, 'trigger', apply)
+
+    async def guard_activate(self, request: web.Request) -> web.Response:
+        def apply(device, data):
+            zone = self._find(
+                device['guard_zones'], request.match_info['zone_id']
+            )
+            if zone is None:
+                return False
+            self.set_guard(device, zone, bool(data.get('enable')))
+        return await self._command(request, 'guard_activate', apply)
+
+    def set_guard(self, device: dict, zone: dict, enable: bool) -> None:
+        """Начинает постановку или снятие охраны."""
+        zone['state'] = 'enabling' if enable else 'disabling'
+        self._timers.append(asyncio.get_running_loop().call_later(
+            self.guard_delay, self._finish_guard, device, zone, enable
+        ))
+
+    def _finish_guard(self, device: dict, zone: dict, enable: bool) -> None:
+        zone['state'] = 'enabled' if enable else 'disabled'
+        self.changed()
+        self.post_webhook(
+            device, 'guard_zone_enabled' if enable else 'guard_zone_disabled',
+            zone['id']
+        )
+
+    def make_event(self, device: dict, event_type: str, object_id) -> dict:
+        """Тело webhook ZONT о событии прибора."""
+        return {
+            'event': {
+                'device_id': device['id'],
+                'device_name': device['name'],
+                'type': event_type,
+                'title': event_type,
+                'details': '',
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'important': False,
+                'source': 'mock',
+                'gps': None,
+                'additional_info': {'object_id': str(object_id)},
+            }
+        }
+
+    def post_webhook(self, device: dict, event_type: str, object_id) -> None:
+        """Отправляет событие на webhook_url в фоне."""
+        if self.webhook_url is None:
+            return
+        task = asyncio.create_task(
+            self._post_webhook(self.make_event(device, event_type, object_id))
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _post_webhook(self, event: dict) -> None:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession()
+        try:
+            async with self._session.post(self.webhook_url, json=event):
+                self.webhooks += 1
+        except ClientError as err:
+            print(f'webhook не отправлен: {err!r}')
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        device = '/api/widget/v3/devices/{device_id}'
+        app.router.add_get('/api/widget/v3/devices', self.devices_v3)
+        app.router.add_post('/api/devices', self.devices_v1)
+        app.router.add_post('/api/send_z3k_command', self.send_z3k_command)
+        app.router.add_post(
+            device + '/circuits/{circuit_id}/actions/target-temp',
+            self.target_temp
+        )
+        app.router.add_post(
+            device + '/modes/{mode_id}/actions/activate', self.activate_mode
+        )
+        app.router.add_post(
+            device + '/controls/{control_id}/actions/trigger', self.trigger
+        )
+        app.router.add_post(
+            device + '/guard-zones/{zone_id}/actions/activate',
+            self.guard_activate
+        )
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Запускает сервер и возвращает корень API для Zont."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f'http://{host}:{port}/api/'
+
+    async def close(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args) -> None:
+    api = MockZontApi(
+        args.devices, args.sensors, args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        guard_delay=args.guard_delay, webhook_url=args.webhook_url,
+        seed=args.seed
+    )
+    api_url_root = await api.start(args.host, args.port)
+    print(f'API ZONT: {api_url_root} ({len(api.body_v3) / 1024:.0f} KB V3)')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--devices', type=int, default=10)
+    parser.add_argument('--sensors', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    parser.add_argument('--guard-delay', type=float, default=1)
+    parser.add_argument('--webhook-url')
+    parser.add_argument('--seed', type=int)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""Синтетические ответы API ZONT для бенчмарков."""
+import random
+
+
+def make_device(device_id: int, sensors: int = 20) -> dict:
+    """Контроллер с контурами, режимами, сенсорами и охранной зоной."""
+    return {
+        'id': device_id,
+        'name': f'Контроллер {device_id}',
+        'online': True,
+        'device_info': {
+            'id': str(device_id),
+            'model': 'H2000+ PRO',
+            'serial': f'SN{device_id:08d}',
+            'widget_type': 'heating',
+            'version': {'hardware': '1.0', 'software': '2.0'},
+        },
+        'circuits': [
+            {
+                'id': 1000 + i,
+                'name': f'Контур {i}',
+                'status': None,
+                'type': 'consumer',
+                'active': bool(i % 2),
+                'actual_temp': 20.0 + i,
+                'is_off': False,
+                'target_temp': 22.0,
+                'current_mode': 2000,
+                'in_summer_mode': False,
+                'min': 5.0,
+                'max': 35.0,
+            }
+            for i in range(4)
+        ],
+        'modes': [
+            {'id': 2000 + i, 'name': f'Режим {i}',
+             'can_be_applied': [1000, 1001, 1002, 1003]}
+            for i in range(5)
+        ],
+        'sensors': [
+            {
+                'id': 3000 + i,
+                'name': f'Датчик {i}',
+                'type': 'temperature',
+                'status': 'ok',
+                'value': 20.0 + i / 10,
+                'unit': '°',
+                'battery': 90 if i % 4 == 0 else None,
+                'rssi': -70.0 if i % 4 == 0 else None,
+            }
+            for i in range(sensors)
+        ],
+        'guard_zones': [
+            {'id': 4000, 'name': 'Охрана', 'state': 'disabled',
+             'alarm': False},
+        ],
+        'controls': {
+            'statuses': [
+                {'id': 5000, 'name': {'name': 'Вход', 'active_label': 'Да',
+                                      'inactive_label': 'Нет'},
+                 'active': False},
+            ],
+            'toggle_buttons': [
+                {'id': 5001, 'name': {'name': 'Реле', 'active_label': 'Вкл',
+                                      'inactive_label': 'Выкл'},
+                 'active': True},
+            ],
+        },
+    }
+
+
+def make_account(devices: int = 10, sensors: int = 20) -> dict:
+    """Ответ /widget/v3/devices с заданным количеством контроллеров."""
+    return {
+        'ok': True,
+        'devices': [make_device(100000 + i, sensors) for i in range(devices)],
+    }
+
+
+def make_account_old(devices: int = 10) -> dict:
+    """Ответ API V1 /devices для тех же контроллеров."""
+    return {
+        'ok': True,
+        'devices': [
+            {
+                'id': 100000 + i,
+                'serial': f'SN{100000 + i:08d}',
+                'name': f'Контроллер {100000 + i}',
+                'widget_type': 'heating',
+                'appliance_type': None,
+                'tempstep': 0.5,
+                'stationary_location': {'loc': [37.6, 55.7]},
+            }
+            for i in range(devices)
+        ],
+    }
+
+
+SENSOR_KINDS = (
+    ('temperature', '°', lambda rng: round(rng.uniform(-25, 80), 1)),
+    ('humidity', '%', lambda rng: round(rng.uniform(20, 90), 1)),
+    ('pressure', 'бар', lambda rng: round(rng.uniform(0.5, 3), 2)),
+    ('voltage', 'В', lambda rng: round(rng.uniform(10, 14), 2)),
+    ('modulation', '%', lambda rng: rng.randint(0, 100)),
+    ('opening', None, lambda rng: None),
+    ('motion', None, lambda rng: None),
+    ('leakage', None, lambda rng: None),
+    ('room_thermostat', None, lambda rng: None),
+)
+GUARD_STATES = ('disabled', 'enabled', 'enabled', 'enabling', 'disabling')
+BOILER_ERRORS = (
+    ('E01', 'Нет розжига'), ('E02', 'Перегрев'),
+    ('E10', 'Низкое давление теплоносителя'),
+)
+
+
+def make_large_device(
+        device_id: int, sensors: int, rng: random.Random
+) -> dict:
+    """
+    Контроллер с разнородным составом: котловой контур (иногда
+    с ошибкой), контуры отопления и ГВС, режимы, аналоговые и
+    бинарные датчики (часть радио - с батареей и rssi), охранные
+    зоны в разных состояниях и все виды элементов управления.
+    """
+    circuits = [{
+        'id': 1000, 'name': 'Котёл', 'status': None, 'type': 'boiler',
+        'active': rng.random() < 0.5,
+        'actual_temp': round(rng.uniform(30, 80), 1), 'is_off': False,
+        'target_temp': 60.0, 'current_mode': None, 'in_summer_mode': False,
+        'min': 30.0, 'max': 85.0,
+    }]
+    if rng.random() < 0.2:
+        oem, text = rng.choice(BOILER_ERRORS)
+        circuits[0]['error'] = {'oem': oem, 'text': text}
+    for i in range(1, rng.randint(2, 6)):
+        dhw = i == 1 and rng.random() < 0.5
+        circuits.append({
+            'id': 1000 + i,
+            'name': 'ГВС' if dhw else f'Контур {i}',
+            'status': None, 'type': 'dhw' if dhw else 'consumer',
+            'active': rng.random() < 0.5,
+            'actual_temp': round(rng.uniform(15, 60), 1), 'is_off': False,
+            'target_temp': 50.0 if dhw else 22.0,
+            'current_mode': 2000, 'in_summer_mode': False,
+            'min': 25.0 if dhw else 5.0, 'max': 75.0 if dhw else 35.0,
+        })
+    circuit_ids = [circuit['id'] for circuit in circuits[1:]]
+    sensor_list = []
+    for i in range(sensors):
+        kind, unit, value = SENSOR_KINDS[i % len(SENSOR_KINDS)]
+        radio = rng.random() < 0.4
+        sensor = {
+            'id': 3000 + i, 'name': f'Датчик {i}', 'type': kind,
+            'status': 'ok' if rng.random() < 0.95 else 'failure',
+            'value': value(rng), 'unit': unit,
+            'battery': rng.randint(5, 100) if radio else None,
+            'rssi': float(rng.randint(-100, -40)) if radio else None,
+        }
+        if unit is None:
+            sensor['triggered'] = rng.random() < 0.1
+        else:
+            sensor['limits'] = {'high': None, 'low': None}
+        sensor_list.append(sensor)
+    return {
+        'id': device_id,
+        'name': f'Контроллер {device_id}',
+        'online': rng.random() < 0.97,
+        'device_info': {
+            'id': str(device_id),
+            'model': rng.choice(('H2000+ PRO', 'H1500+', 'SMART 2.0')),
+            'serial': f'SN{device_id:08d}',
+            'widget_type': 'heating',
+            'version': {'hardware': '1.0', 'software': '2.0'},
+        },
+        'circuits': circuits,
+        'modes': [
+            {'id': 2000 + i, 'name': name,
+             'can_be_applied': rng.sample(
+                 circuit_ids, rng.randint(1, len(circuit_ids)))}
+            for i, name in enumerate(
+                ('Комфорт', 'Эконом', 'Расписание', 'Антизамерзание',
+                 'Отпуск'))
+        ],
+        'sensors': sensor_list,
+        'guard_zones': [
+            {'id': 4000 + i, 'name': f'Зона {i}',
+             'state': rng.choice(GUARD_STATES),
+             'alarm': rng.random() < 0.05}
+            for i in range(rng.randint(1, 3))
+        ],
+        'controls': {
+            'buttons': [
+                {'id': 5100 + i, 'name': f'Кнопка {i}'} for i in range(2)
+            ],
+            'statuses': [
+                {'id': 5000 + i,
+                 'name': {'name': f'Вход {i}', 'active_label': 'Да',
+                          'inactive_label': 'Нет'},
+                 'active': rng.random() < 0.5}
+                for i in range(2)
+            ],
+            'toggle_buttons': [
+                {'id': 5200 + i,
+                 'name': {'name': f'Реле {i}', 'active_label': 'Вкл',
+                          'inactive_label': 'Выкл'},
+                 'active': rng.random() < 0.5}
+                for i in range(3)
+            ],
+            'regulators': [
+                {'id': 5300, 'name': 'Регулятор', 'value': 5, 'min': 0,
+                 'max': 10, 'step': 1, 'unit': 'В'},
+            ],
+        },
+    }
+
+
+def make_large_account(
+        devices: int = 100, sensors: int = 100, seed: int = 0
+) -> dict:
+    """
+    Ответ /widget/v3/devices большого аккаунта. При одном seed
+    содержимое воспроизводится от запуска к запуску.
+    """
+    rng = random.Random(seed)
+    return {
+        'ok': True,
+        'devices': [
+            make_large_device(100000 + i, sensors, rng)
+            for i in range(devices)
+        ],
+    }
@@ -1,29 +1,62 @@
+import asyncio
 import json
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
 
 import async_timeout
 
 from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_registry import async_get
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator, UpdateFailed
 )
+from homeassistant.util import dt as dt_util
 from .const import (
     DOMAIN, PLATFORMS, TIME_UPDATE, MANUFACTURER,
-    CONFIGURATION_URL, COUNTER_CONNECT, TIME_OUT_UPDATE_DATA, ENTRIES,
-    CURRENT_ENTITY_IDS
+    CONFIGURATION_URL, TIME_OUT_UPDATE_DATA, ENTRIES,
+    CURRENT_ENTITY_IDS, CONF_WEBHOOK_DEBOUNCE, TIME_WEBHOOK_DEBOUNCE,
+    TIME_OUT_CONFIRM, TIME_CONFIRM_STEP, TIME_CONFIRM_MAX_STEP,
+    CONF_POLL_MIN_INTERVAL, CONF_POLL_MAX_INTERVAL, CONF_HEDGE_REQUESTS,
+    TIME_POLL_MIN, TIME_POLL_MAX, RATE_LIMITERS, TIME_OUT_PROBE,
+    TIME_STALE_UNAVAILABLE, ATTR_STALE,
+    CONF_DECODE_EXECUTOR_SIZE, SIZE_DECODE_EXECUTOR
 )
+from .core.breaker import CircuitBreaker
+from .core.delta import ChangeSet
+from .core.events import WebhookCoalescer
+from .core.exceptions import ResponseZontError, ThrottledZontError
 from .core.models_zont_v3 import DeviceZONT
-from .core.models_zont_webhook import DeviceEventWebhook, EventZONT
+from .core.profiler import profile_section
+from .core.ratelimit import TokenBucket
+from .core.scheduler import PollScheduler
+from .core.session import async_acquire_session, async_release_session
+from .core.snapshot import SnapshotStore
+from .core.stats import PollStats
+from .core.timings import PhaseTimer
+from .core.watchers import GuardTransitionWatcher
+from .core.models_zont_webhook import EventZONT
+from .core.optimistic import PendingValue
 from .core.zont import Zont
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+def get_api_device_id(entry_id: str) -> str:
+    """Идентификатор служебного устройства "ZONT API" записи."""
+    return f'{entry_id}_api'
+
 
 def remove_entity(hass: HomeAssistant, current_entries_id: list,
                   config_entry: ConfigEntry):
@@ -52,9 +85,12 @@ async def remove_devices(
     if not selected_devices:
         _LOGGER.debug(f'There are no selected devices: {selected_devices}')
         return
+    api_device_id = get_api_device_id(config_entry.entry_id)
     for device in all_devices:
         _LOGGER.debug(f'device identifiers: {device.identifiers}')
         device_id = str(list(device.identifiers)[0][1])
+        if device_id == api_device_id:
+            continue
         if not device_id in selected_devices:
             device_reg.async_remove_device(device.id)
             _LOGGER.info(f"Device is removed: {device.name} ({device_id})")
@@ -87,6 +123,18 @@ def register_webhook(
     _LOGGER.debug(f'Webhooks after registration: {registered}')
 
 
+def get_rate_limiter(hass: HomeAssistant, email: str) -> TokenBucket:
+    """Общий ограничитель запросов для всех записей одного аккаунта."""
+    limiters = hass.data.setdefault(DOMAIN, {}).setdefault(RATE_LIMITERS, {})
+    return limiters.setdefault(email, TokenBucket())
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Регистрация сервисов интеграции."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(
         hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     _LOGGER.debug('async_setup_entry start')
@@ -97,14 +145,44 @@ async def async_setup_entry(
     email = config_entry.data.get('mail')
     token = config_entry.data.get('token')
     selected_devices = config_entry.data.get('devices_selected')
-    zont = Zont(hass, email, token, selected_devices)
+    session = async_acquire_session(hass)
+    config_entry.async_on_unload(partial(async_release_session, hass))
+    zont = Zont(
+        hass, email, token, selected_devices, session=session,
+        limiter=get_rate_limiter(hass, email),
+        hedge=config_entry.data.get(CONF_HEDGE_REQUESTS, False),
+        executor_threshold=config_entry.data.get(
+            CONF_DECODE_EXECUTOR_SIZE, SIZE_DECODE_EXECUTOR
+        ) * 1024
+    )
     _LOGGER.debug(f'selected devices: {selected_devices}')
-
-    await remove_devices(hass, config_entry, selected_devices)
-
-    await zont.init_old_data()
-    coordinator = ZontCoordinator(hass, zont)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = ZontCoordinator(hass, zont, config_entry)
+    config_entry.async_on_unload(coordinator.async_shutdown)
+    startup = coordinator.startup
+    started = time.perf_counter()
+
+    with startup.measure('registry_cleanup'):
+        await remove_devices(hass, config_entry, selected_devices)
+
+    with startup.measure('snapshot'):
+        warm = zont.load_snapshot(await coordinator.snapshot.async_load())
+    if warm:
+        # Сущности создаются из сохранённых данных, API опрашивается в фоне.
+        _LOGGER.info(f'Тёплый старт {email} из сохранённых данных')
+        # Данные снимка устаревшие, пока не получен ответ API.
+        coordinator.stale = True
+        coordinator.async_set_updated_data(zont)
+        config_entry.async_create_background_task(
+            hass, coordinator.async_warm_refresh(),
+            f'{DOMAIN} warm refresh {entry_id}'
+        )
+    else:
+        # Данные API V1 и V3 независимы, запрашиваем их одновременно.
+        with startup.measure('fetch'):
+            await asyncio.gather(
+                zont.init_old_data(),
+                coordinator.async_config_entry_first_refresh()
+            )
     _LOGGER.debug(f'config entry data: {config_entry.data}')
 
     register_webhook(hass, entry_id, email, selected_devices)
@@ -115,11 +193,15 @@ async def async_setup_entry(
     hass.data[DOMAIN][CURRENT_ENTITY_IDS][entry_id] = []
     hass.data[DOMAIN][ENTRIES][entry_id] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(
-        config_entry, PLATFORMS
-    )
+    with startup.measure('platform_setup'):
+        await hass.config_entries.async_forward_entry_setups(
+            config_entry, PLATFORMS
+        )
     current_entries_id = hass.data[DOMAIN][CURRENT_ENTITY_IDS][entry_id]
-    remove_entity(hass, current_entries_id, config_entry)
+    with startup.measure('entity_cleanup'):
+        remove_entity(hass, current_entries_id, config_entry)
+    startup.record('total', time.perf_counter() - started)
+    _LOGGER.debug(f'Запуск {zont.mail}: {startup.as_dict()}')
     _LOGGER.debug(f'The unique ID of the current account entities {zont.mail}:'
                   f' {current_entries_id}')
     _LOGGER.debug(f'Number of relevant entities: '
@@ -132,23 +214,30 @@ async def handle_webhook(
     coordinator = hass.data[DOMAIN][ENTRIES][entry_id]
 
     body = await request.text()
-    try:
-        data_json = json.loads(body)
-        event_zont = EventZONT.model_validate(data_json)
-        data = event_zont.event
-        device_id = data.device_id
-
-        if str(device_id) in selected_devices:
-            pretty_json = json.dumps(data_json, ensure_ascii=False, indent=2,
-                                     sort_keys=True)
-            _LOGGER.debug(f'📨 Received webhook request. '
-                          f'Webhook id: {webhook_id}. '
-                          f'Device id: {webhook_id}. '
-                          f'Body: {pretty_json}')
-            await coordinator.async_request_refresh()
-    except ValueError:
-        _LOGGER.warning(f'Wrong webhook request. Webhook id: {webhook_id}. '
-                        f'Body: {body}')
+    with profile_section(coordinator.zont.profiler, 'webhook'):
+        try:
+            data_json = json.loads(body)
+            event_zont = EventZONT.model_validate(data_json)
+            data = event_zont.event
+            device_id = data.device_id
+
+            if str(device_id) in selected_devices:
+                pretty_json = json.dumps(data_json, ensure_ascii=False,
+                                         indent=2, sort_keys=True)
+                _LOGGER.debug(f'📨 Received webhook request. '
+                              f'Webhook id: {webhook_id}. '
+                              f'Device id: {webhook_id}. '
+                              f'Body: {pretty_json}')
+                coordinator.scheduler.record_webhook()
+                # Идущий опрос мог начаться до события.
+                coordinator.zont.mark_stale()
+                coordinator.webhook.push(data)
+            else:
+                coordinator.webhook.drop()
+        except ValueError:
+            coordinator.webhook.drop()
+            _LOGGER.warning(f'Wrong webhook request. '
+                            f'Webhook id: {webhook_id}. Body: {body}')
 
 
 async def update_listener(hass, entry):
@@ -156,6 +245,12 @@ async def update_listener(hass, entry):
     _LOGGER.info(f'Restarting integration for entry_id: {entry.entry_id})')
     await hass.config_entries.async_reload(entry.entry_id)
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Удаляет сохранённые данные при удалении интеграции."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     _LOGGER.info(f'Unloading the zont_ha integration: {entry.entry_id}')
@@ -174,16 +269,178 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 class ZontCoordinator(DataUpdateCoordinator):
     """Координатор для общего обновления данных"""
 
-    _count_connect: int = 0
-
-    def __init__(self, hass, zont):
+    def __init__(self, hass, zont, config_entry: ConfigEntry):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name="ZONT",
             update_interval=timedelta(seconds=TIME_UPDATE),
         )
         self.zont: Zont = zont
+        self.changes: ChangeSet | None = None
+        self._revision: int = 0
+        self.startup = PhaseTimer()
+        self.stats = PollStats()
+        self._update_started: float | None = None
+        self._notified: int = 0
+        self.breaker = CircuitBreaker()
+        self.stale: bool = False
+        self.snapshot = SnapshotStore(hass, config_entry.entry_id, zont)
+        self.scheduler = PollScheduler(
+            config_entry.data.get(CONF_POLL_MIN_INTERVAL, TIME_POLL_MIN),
+            config_entry.data.get(CONF_POLL_MAX_INTERVAL, TIME_POLL_MAX),
+            self.zont.has_guard_transition
+        )
+        self.update_interval = timedelta(
+            seconds=self.scheduler.base_interval
+        )
+        self.webhook = WebhookCoalescer(
+            self.async_refresh,
+            config_entry.data.get(
+                CONF_WEBHOOK_DEBOUNCE, TIME_WEBHOOK_DEBOUNCE
+            ),
+            lambda target: config_entry.async_create_background_task(
+                hass, target,
+                f'{DOMAIN} webhook refresh {config_entry.entry_id}'
+            )
+        )
+        self.guard_watcher = GuardTransitionWatcher(
+            self.async_refresh, self.zont.has_guard_transition,
+            lambda target: config_entry.async_create_background_task(
+                hass, target,
+                f'{DOMAIN} guard transition {config_entry.entry_id}'
+            )
+        )
+
+    @callback
+    def async_notify_changes(self, changes: ChangeSet) -> None:
+        """Уведомляет сущности об изменениях без запроса к API."""
+        if not changes:
+            return
+        self.changes = changes
+        self.async_update_listeners()
+
+    @callback
+    def _revert_pending(self, values: tuple[PendingValue, ...]) -> None:
+        """Откатывает неподтверждённые значения к значениям API."""
+        changes = ChangeSet()
+        for value in values:
+            changes.update(self.zont.pending.revert(value, self.zont.index))
+        self.async_notify_changes(changes)
+
+    async def async_command(
+            self, command: Awaitable, *values: PendingValue
+    ) -> None:
+        """
+        Отправляет команду управления с оптимистичным обновлением.
+        Новые значения сразу показываются в интерфейсе, затем данные
+        обновляются с нарастающим интервалом, пока API их не подтвердит.
+        Без подтверждения за TIME_OUT_CONFIRM значения откатываются.
+        """
+        self.scheduler.boost()
+        changes = ChangeSet()
+        for value in values:
+            changes.update(self.zont.add_pending(value))
+        self.async_notify_changes(changes)
+        try:
+            await command
+        except Exception:
+            self._revert_pending(values)
+            raise
+        if not values:
+            await self.async_request_refresh()
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + TIME_OUT_CONFIRM
+        delay = TIME_CONFIRM_STEP
+        while (not all(value.done for value in values)
+               and loop.time() + delay <= deadline):
+            await asyncio.sleep(delay)
+            await self.async_refresh()
+            delay = min(delay * 2, TIME_CONFIRM_MAX_STEP)
+        failed = tuple(value for value in values if not value.done)
+        if failed:
+            self._revert_pending(failed)
+            raise ResponseZontError(
+                f'Устройство не подтвердило изменение состояния: {failed}'
+            )
+
+    async def async_warm_refresh(self) -> None:
+        """Обновляет данные тёплого старта из API."""
+        await asyncio.gather(
+            self._async_refresh_old_data(), self.async_refresh()
+        )
+
+    async def _async_refresh_old_data(self) -> None:
+        """
+        Обновляет данные API V1 (шаг температуры, расположение) и
+        уведомляет устройства, данные которых изменились.
+        """
+        try:
+            changes = await self.zont.init_old_data()
+        except Exception as err:
+            _LOGGER.warning(f'Не удалось обновить данные API V1: {err}')
+            return
+        if changes:
+            self.async_notify_changes(changes)
+            self.snapshot.async_schedule_save()
+
+    async def async_shutdown(self) -> None:
+        """Остановка фоновых задач координатора при выгрузке записи."""
+        self.webhook.cancel()
+        self.guard_watcher.cancel()
+        self.zont.commands.cancel()
+        self.zont.flight.cancel()
+        await super().async_shutdown()
+
+    def is_changed(
+            self, device_id: int, object_id: int | str | None = None
+    ) -> bool:
+        """
+        Изменился ли объект устройства при последнем обновлении.
+        Сущности пропускают запись состояния, если их объект не менялся.
+        """
+        if self.changes is None or self.changes.is_changed(
+                device_id, object_id):
+            self._notified += 1
+            return True
+        return False
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Раздаёт обновление сущностям и учитывает статистику: для опроса
+        с новыми данными - длительность, задержку API и размер ответа,
+        для каждой раздачи - число обновлённых сущностей.
+        """
+        timings = self.zont.timings
+        if self._update_started is not None:
+            self.stats.record(
+                duration=time.perf_counter() - self._update_started,
+                latency=timings.last.get('fetch', 0),
+                payload=self.zont.payload_bytes or 0,
+            )
+            self._update_started = None
+        self._notified = 0
+        with timings.measure('dispatch'), profile_section(
+                self.zont.profiler, 'dispatch'):
+            super().async_update_listeners()
+        self.stats.record(notified=self._notified)
+        self.stats.notify()
+
+    def api_device_info(self) -> DeviceInfo:
+        """Служебное устройство записи для диагностических сенсоров."""
+        return DeviceInfo(
+            identifiers={
+                (DOMAIN, get_api_device_id(self.config_entry.entry_id))
+            },
+            name=f'ZONT API {self.config_entry.title}',
+            manufacturer=MANUFACTURER,
+            configuration_url=CONFIGURATION_URL,
+            entry_type=DeviceEntryType.SERVICE,
+        )
 
     def devices_info(self, device_id: int):
         device: DeviceZONT = self.zont.get_device(device_id)
@@ -199,24 +456,130 @@ class ZontCoordinator(DataUpdateCoordinator):
         })
         return device_info
 
+    def _schedule_next_poll(self) -> None:
+        """
+        Задаёт интервал следующего опроса: не раньше окончания паузы
+        после ответа 429 и открытого breaker. Координатор планирует
+        следующее обновление после _async_update_data по update_interval.
+        """
+        self.update_interval = timedelta(seconds=max(
+            self.scheduler.next_interval(), self.breaker.retry_in,
+            self.zont.limiter.paused_for
+        ))
+
+    @property
+    def data_age(self) -> float | None:
+        """Возраст данных с последнего успешного запроса к API, с."""
+        if self.zont.updated_at is None:
+            return None
+        return time.time() - self.zont.updated_at
+
+    @property
+    def data_updated_at(self) -> datetime | None:
+        """Время последнего успешного запроса к API."""
+        if self.zont.updated_at is None:
+            return None
+        return dt_util.utc_from_timestamp(self.zont.updated_at)
+
+    def data_attributes(self) -> dict[str, Any]:
+        """
+        Атрибут свежести данных для сущностей. Время получения данных
+        показывает сенсор updated_at устройства "ZONT API": сущности
+        записывают состояние только при изменении своего объекта.
+        """
+        return {ATTR_STALE: self.stale}
+
+    def _set_stale(self, stale: bool) -> None:
+        """При смене свежести данных обновляются все сущности."""
+        if stale != self.stale:
+            self.stale = stale
+            self.changes = None
+
+    def _stale_data(self, err: Exception | str) -> Zont:
+        """
+        Данные при недоступном API: последние полученные, пока они не
+        старше TIME_STALE_UNAVAILABLE. Затем сущности становятся
+        недоступны.
+        """
+        age = self.data_age
+        if self.zont.data is None or age is None or (
+                age > TIME_STALE_UNAVAILABLE):
+            self.changes = None
+            raise UpdateFailed(f'Ошибка соединения с API zont: {err}')
+        self.changes = ChangeSet()
+        self._set_stale(True)
+        return self.zont
+
     async def _async_update_data(self):
         """Обновление данных API zont"""
+        with profile_section(self.zont.profiler, 'update'):
+            return await self._async_poll()
+
+    async def _async_poll(self):
+        if self.zont.limiter.paused_for and self.zont.data is not None:
+            # API попросил снизить частоту (429): опрос откладывается
+            # до конца паузы и не считается ошибкой.
+            self.changes = ChangeSet()
+            self._schedule_next_poll()
+            return self.zont
+        if not self.breaker.allow():
+            self._schedule_next_poll()
+            return self._stale_data(
+                f'запросы приостановлены ещё на '
+                f'{self.breaker.retry_in:.0f} с.'
+            )
+        timeout = (
+            TIME_OUT_PROBE if self.breaker.probing else TIME_OUT_UPDATE_DATA
+        )
+        started = time.perf_counter()
         try:
-            async with async_timeout.timeout(TIME_OUT_UPDATE_DATA):
+            async with async_timeout.timeout(timeout):
                 await self.zont.get_update()
-                self._count_connect = 0
-                return self.zont
+        except ThrottledZontError as err:
+            # API ответил и попросил снизить частоту: это не отказ API,
+            # следующий опрос будет после паузы ограничителя.
+            self.breaker.record_success()
+            self.stats.notify()
+            self._schedule_next_poll()
+            _LOGGER.warning(f'Обновление данных ZONT отложено: {err}')
+            return self._stale_data(err)
         except Exception as err:
-            if self._count_connect < COUNTER_CONNECT:
-                self._count_connect += 1
-                _LOGGER.warning(err)
-                _LOGGER.warning(
-                    f'Неудачная попытка обновления данных ZONT. '
-                    f'Осталось попыток: {COUNTER_CONNECT - self._count_connect}'
-                )
-                return self.zont
-            else:
-                raise UpdateFailed(f"Ошибка соединения с API zont: {err}")
+            # Неудачный общий запрос ждут несколько обновлений
+            # (подтверждение команды, плановый опрос): ошибка
+            # учитывается один раз на запрос.
+            if self.breaker.record_failure(self.zont.flight.fetches):
+                self.scheduler.record_error()
+                self.stats.record_failure()
+            self.stats.notify()
+            self._schedule_next_poll()
+            _LOGGER.warning(f'Неудачная попытка обновления данных ZONT: '
+                            f'{err!r}')
+            return self._stale_data(err)
+        self.breaker.record_success()
+        if self.zont.revision == self._revision:
+            # Данные получены общим запросом и уже разосланы.
+            self.changes = ChangeSet()
+            return self.zont
+        self._revision = self.zont.revision
+        self._update_started = started
+        # После ошибки обновления сущности должны обновиться все.
+        self.changes = (
+            self.zont.changes if self.last_update_success else None
+        )
+        self.scheduler.record_success(self.changes is None
+                                      or bool(self.changes))
+        self._set_stale(False)
+        if self.changes is None or self.changes:
+            self.snapshot.async_schedule_save()
+        if self.zont.old_data_expired:
+            self.config_entry.async_create_background_task(
+                self.hass, self._async_refresh_old_data(),
+                f'{DOMAIN} V1 refresh {self.config_entry.entry_id}'
+            )
+        self._schedule_next_poll()
+        if self.zont.has_guard_transition():
+            self.guard_watcher.start()
+        return self.zont
 
 
 async def async_migrate_entry(hass, config_entry):
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from homeassistant.components.alarm_control_panel import (
@@ -8,13 +7,12 @@ from homeassistant.components.alarm_control_panel import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator, DOMAIN
-from .const import (
-    COUNTER_REPEAT, TIME_OUT_REPEAT, TIME_OUT_REQUEST, CURRENT_ENTITY_IDS,
-    ENTRIES
-)
+from .const import CURRENT_ENTITY_IDS, ENTRIES
+from .entity import ZontCoordinatorEntity
+from .core.enums import GuardState
 from .core.models_zont_v3 import DeviceZONT, GuardZoneZONT
+from .core.optimistic import PendingValue
 from .core.zont import Zont
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,7 +42,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены охранные зоны: {alarms}')
 
 
-class ZontAlarm(CoordinatorEntity, AlarmControlPanelEntity):
+class ZontAlarm(ZontCoordinatorEntity, AlarmControlPanelEntity):
 
     _attr_code_format = None
     _attr_code_arm_required = False
@@ -86,44 +84,47 @@ class ZontAlarm(CoordinatorEntity, AlarmControlPanelEntity):
             return f"<Alarm entity {self.name}>"
         return super().__repr__()
 
-    async def _repeat_check_state(self):
+    async def _async_toggle(self, command: bool) -> None:
         """
-        Обновляем статус охранной зоны пока не получим стабильное
-        состояние охранной зоны (под охраной или снято с охраны)
+        Постановка или снятие с охраны. Зона сразу показывается в
+        переходном состоянии, дальнейший опрос ведёт общий наблюдатель.
         """
-        counter = COUNTER_REPEAT
-        while self._zont.need_repeat_update(
-                self._guard_zone.state) and counter > 0:
-            counter -= 1
-            await self.coordinator.async_request_refresh()
-            _LOGGER.debug(f'Обновляю статус охраны ещё {counter} раз.')
-            await asyncio.sleep(TIME_OUT_REPEAT)
+        if command:
+            state = GuardState.ENABLING
+            accepted = (GuardState.ENABLING, GuardState.ENABLED)
+        else:
+            state = GuardState.DISABLING
+            accepted = (GuardState.DISABLING, GuardState.DISABLED)
+        await self.coordinator.async_command(
+            self._zont.toggle_alarm(
+                device=self._device, guard_zone=self._guard_zone,
+                command=command
+            ),
+            PendingValue(
+                'guard_zones', self._device.id, self._guard_zone.id,
+                'state', state, accepted
+            )
+        )
+        self.coordinator.guard_watcher.start(reset=True)
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
-        await self._zont.toggle_alarm(
-            device=self._device, guard_zone=self._guard_zone, command=False
-        )
-        await asyncio.sleep(TIME_OUT_REQUEST)
-        await self.coordinator.async_request_refresh()
-        await self._repeat_check_state()
+        await self._async_toggle(False)
 
     async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send arm home command."""
-        await self._zont.toggle_alarm(
-            device=self._device, guard_zone=self._guard_zone, command=True
-        )
-        await asyncio.sleep(TIME_OUT_REQUEST)
-        await self.coordinator.async_request_refresh()
-        await self._repeat_check_state()
+        await self._async_toggle(True)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
+        if not self.coordinator.is_changed(
+                self._device.id, self._guard_zone.id):
+            return
         self._device: DeviceZONT = self.coordinator.zont.get_device(
             self._device.id
         )
-        self._guard_zone = self._zont.get_guard_zone(
-            self._device, self._guard_zone.id
+        self._guard_zone = self._zont.find_guard_zone(
+            self._device.id, self._guard_zone.id
         )
         self.async_write_ha_state()
@@ -6,11 +6,11 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator
 from .const import (
     DOMAIN, CURRENT_ENTITY_IDS, ENTRIES
 )
+from .entity import ZontCoordinatorEntity
 from .core.models_zont_v3 import (SensorZONT, DeviceZONT, StatusZONT)
 from .core.utils import is_binary_sensor
 from .core.zont import type_binary_sensor, Zont
@@ -52,7 +52,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены бинарные сенсоры: {binary_sensors}')
 
 
-class ZontOnlineBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class ZontOnlineBinarySensor(ZontCoordinatorEntity, BinarySensorEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -90,7 +90,8 @@ class ZontOnlineBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
-
+        if not self.coordinator.is_changed(self._device.id):
+            return
         device = self.coordinator.zont.get_device(self._device.id)
         if device.online != self._device.online:
             _LOGGER.debug(
@@ -102,7 +103,7 @@ class ZontOnlineBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.async_write_ha_state()
 
 
-class ZontBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class ZontBinarySensor(ZontCoordinatorEntity, BinarySensorEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -155,7 +156,8 @@ class ZontBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
-
+        if not self.coordinator.is_changed(self._device.id, self._sensor.id):
+            return
         sensor = self.coordinator.zont.get_sensor(
             self._device.id,
             self._sensor.id
@@ -168,7 +170,7 @@ class ZontBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.async_write_ha_state()
 
 
-class ZontBinarySensorControl(CoordinatorEntity, BinarySensorEntity):
+class ZontBinarySensorControl(ZontCoordinatorEntity, BinarySensorEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -203,7 +205,9 @@ class ZontBinarySensorControl(CoordinatorEntity, BinarySensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
-
+        if not self.coordinator.is_changed(
+                self._device.id, self._status_control.id):
+            return
         status_control: StatusZONT = (
             self.coordinator.zont.get_status_control(
                 self._device.id, self._status_control.id)
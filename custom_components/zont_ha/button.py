@@ -1,17 +1,16 @@
-import asyncio
 import logging
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator
 from .const import (
-    DOMAIN, BUTTON_ZONT, MANUFACTURER, TIME_OUT_REQUEST, ENTRIES,
-    CURRENT_ENTITY_IDS
+    DOMAIN, BUTTON_ZONT, MANUFACTURER, ENTRIES, CURRENT_ENTITY_IDS
 )
+from .entity import ZontCoordinatorEntity
 from .core.models_zont_v3 import DeviceZONT, ButtonZONT, HeatingModeZONT
+from .core.optimistic import PendingValue
 from .core.utils import get_icon
 from .core.zont import Zont
 
@@ -57,7 +56,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены кнопки: {mode_buttons}')
 
 
-class ButtonZont(CoordinatorEntity, ButtonEntity):
+class ButtonZont(ZontCoordinatorEntity, ButtonEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator,
@@ -78,6 +77,12 @@ class ButtonZont(CoordinatorEntity, ButtonEntity):
             return f"<Button entity {self.name}>"
         return super().__repr__()
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Обработка обновлённых данных от координатора"""
+        if self.coordinator.is_changed(self._device.id):
+            self.async_write_ha_state()
+
 
 class HeatingModeButton(ButtonZont):
 
@@ -95,11 +100,18 @@ class HeatingModeButton(ButtonZont):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await (self._zont.set_heating_mode_all_circuits(
-            device=self._device, heating_mode=self._heating_mode)
+        await self.coordinator.async_command(
+            self._zont.set_heating_mode_all_circuits(
+                device=self._device, heating_mode=self._heating_mode
+            ),
+            *(
+                PendingValue(
+                    'circuits', self._device.id, circuit_id,
+                    'current_mode', self._heating_mode.id
+                )
+                for circuit_id in self._heating_mode.can_be_applied
+            )
         )
-        await asyncio.sleep(TIME_OUT_REQUEST)
-        await self.coordinator.async_request_refresh()
 
 
 class ZontControlButton(ButtonZont):
@@ -117,10 +129,10 @@ class ZontControlButton(ButtonZont):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._zont.switch_button(
-            device=self._device,
-            button=self._button,
-            command=True
+        await self.coordinator.async_command(
+            self._zont.switch_button(
+                device=self._device,
+                button=self._button,
+                command=True
+            )
         )
-        await asyncio.sleep(TIME_OUT_REQUEST)
-        await self.coordinator.async_request_refresh()
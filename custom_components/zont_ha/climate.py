@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from homeassistant.components.climate import (
@@ -8,16 +7,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator, DOMAIN
 from .const import (
-    TIME_OUT_REQUEST, MAX_TEMP_AIR, MIN_TEMP_AIR, MODELS_THERMOSTAT_ZONT,
+    MAX_TEMP_AIR, MIN_TEMP_AIR, MODELS_THERMOSTAT_ZONT,
     ENTRIES, CURRENT_ENTITY_IDS, PLUS, PRO
 )
+from .entity import ZontCoordinatorEntity
 from .core.enums import TypeOfCircuit
 from .core.exceptions import TemperatureOutOfRangeError, SetHvacModeError
-from .core.models_zont_v1 import DeviceZontOld
 from .core.models_zont_v3 import CircuitZONT, DeviceZONT
+from .core.optimistic import PendingValue
 from .core.zont import Zont
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,7 +48,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены термостаты: {thermostats}')
 
 
-class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
+class ZontClimateEntity(ZontCoordinatorEntity, ClimateEntity):
     """Базовый класс для климата zont"""
 
     _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
@@ -70,12 +69,18 @@ class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
         self._circuit = circuit
         self._unique_id = unique_id
         self._zont = coordinator.zont
-        self._device_old: DeviceZontOld = self._zont.get_device_old(device.id)
-        self._attr_target_temperature_step = self._device_old.tempstep
         self._attr_min_temp, self._attr_max_temp = (
             self._zont.get_min_max_values_temp(self._circuit))
         self._attr_device_info = coordinator.devices_info(device.id)
 
+    @property
+    def target_temperature_step(self) -> float | None:
+        """Шаг уставки из данных API V1, которые периодически обновляются."""
+        device_old = self._zont.get_device_old(self._device.id)
+        if device_old is None:
+            return None
+        return device_old.tempstep
+
     @property
     def preset_modes(self) -> list[str] | None:
         _preset_modes = self._zont.get_names_heating_mode(
@@ -87,8 +92,8 @@ class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
     @property
     def preset_mode(self) -> str | None:
         heating_mode_id = self._circuit.current_mode
-        heating_mode = self._zont.get_heating_mode_by_id(
-            self._device, heating_mode_id
+        heating_mode = self._zont.find_heating_mode_by_id(
+            self._device.id, heating_mode_id
         )
         if heating_mode is not None:
             return heating_mode.name
@@ -132,13 +137,14 @@ class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
         """Set new target temperature."""
         set_temp = kwargs.get('temperature')
         if self._attr_min_temp <= set_temp <= self._attr_max_temp:
-            await self._zont.set_target_temperature(
-                device=self._device,
-                circuit=self._circuit,
-                target_temp=set_temp
+            await self.coordinator.async_command(
+                self._zont.set_target_temperature(
+                    device=self._device,
+                    circuit=self._circuit,
+                    target_temp=set_temp
+                ),
+                self._pending_value('target_temp', set_temp)
             )
-            await asyncio.sleep(TIME_OUT_REQUEST)
-            await self.coordinator.async_request_refresh()
         else:
             raise TemperatureOutOfRangeError(
                 f'Недопустимое значение температуры: {set_temp}. '
@@ -148,34 +154,42 @@ class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
 
     async def async_set_preset_mode(self, preset_mode):
         """Set new target preset mode."""
-        heating_mode = self._zont.get_heating_mode_by_name(
-            self._device, preset_mode
+        heating_mode = self._zont.find_heating_mode_by_name(
+            self._device.id, preset_mode
         )
         model = self._device.device_info.model
         if heating_mode is not None:
             if self._device.device_info.model in MODELS_THERMOSTAT_ZONT:
-                await self._zont.set_heating_mode_all_circuits(
+                command = self._zont.set_heating_mode_all_circuits(
                     device=self._device,
                     heating_mode=heating_mode
                 )
             elif PLUS in model.lower() or PRO in model.lower():
-                await self._zont.set_heating_mode(
+                command = self._zont.set_heating_mode(
                     device=self._device,
                     circuit=self._circuit,
                     heating_mode_id=heating_mode.id
                 )
             else:
-                await self._zont.set_heating_mode_v1(
+                command = self._zont.set_heating_mode_v1(
                     self._device, self._circuit, heating_mode.id)
+            current_mode = heating_mode.id
         else:
-            await self._zont.set_target_temperature(
+            command = self._zont.set_target_temperature(
                 device=self._device,
                 circuit=self._circuit,
                 target_temp=self._circuit.target_temp
             )
-            self._circuit.current_mode = None
-        await asyncio.sleep(TIME_OUT_REQUEST)
-        await self.coordinator.async_request_refresh()
+            current_mode = None
+        await self.coordinator.async_command(
+            command, self._pending_value('current_mode', current_mode)
+        )
+
+    def _pending_value(self, attr: str, value) -> PendingValue:
+        """Оптимистичное значение атрибута контура."""
+        return PendingValue(
+            'circuits', self._device.id, self._circuit.id, attr, value
+        )
 
     def __repr__(self) -> str:
         if not self.hass:
@@ -192,10 +206,12 @@ class ZontClimateEntity(CoordinatorEntity, ClimateEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
+        if not self.coordinator.is_changed(self._device.id, self._circuit.id):
+            return
         self._device: DeviceZONT = self.coordinator.zont.get_device(
             self._device.id
         )
-        self._circuit = self._zont.get_circuit(
-            self._device, self._circuit.id
+        self._circuit = self._zont.find_circuit(
+            self._device.id, self._circuit.id
         )
         self.async_write_ha_state()
@@ -10,7 +10,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN, URL_TOKEN, URL_GET_DEVICES
+from .const import (
+    DOMAIN, URL_TOKEN, URL_GET_DEVICES, CONF_WEBHOOK_DEBOUNCE,
+    TIME_WEBHOOK_DEBOUNCE, MAX_WEBHOOK_DEBOUNCE, CONF_POLL_MIN_INTERVAL,
+    CONF_POLL_MAX_INTERVAL, TIME_POLL_MIN, TIME_POLL_MAX, LIMIT_POLL_INTERVAL,
+    CONF_HEDGE_REQUESTS, CONF_DECODE_EXECUTOR_SIZE, SIZE_DECODE_EXECUTOR,
+    LIMIT_DECODE_EXECUTOR
+)
 from .core.exceptions import RequestAPIZONTError, InvalidMail
 from .core.models_zont_v3 import TokenZont, ErrorZont, DeviceZONT, AccountZont
 
@@ -269,9 +275,25 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         errors: dict[str, str] = {}
         self.data = dict(self.config_entry.data)
         if user_input is not None:
+            if (user_input.get(CONF_POLL_MIN_INTERVAL, TIME_POLL_MIN)
+                    > user_input.get(CONF_POLL_MAX_INTERVAL, TIME_POLL_MAX)):
+                errors['base'] = 'invalid_poll_interval'
+        if user_input is not None and not errors:
             try:
-                if not errors:
+                if user_input.get('option') == 'option1':
                     self.data['devices_selected'] = []
+                if not errors:
+                    self.data[CONF_WEBHOOK_DEBOUNCE] = user_input.get(
+                        CONF_WEBHOOK_DEBOUNCE, TIME_WEBHOOK_DEBOUNCE
+                    )
+                    for key, default in (
+                            (CONF_POLL_MIN_INTERVAL, TIME_POLL_MIN),
+                            (CONF_POLL_MAX_INTERVAL, TIME_POLL_MAX),
+                            (CONF_DECODE_EXECUTOR_SIZE, SIZE_DECODE_EXECUTOR)):
+                        self.data[key] = user_input.get(key, default)
+                    self.data[CONF_HEDGE_REQUESTS] = user_input.get(
+                        CONF_HEDGE_REQUESTS, False
+                    )
                 if user_input.get('option') == 'option2':
                     devices = await validate_auth_token(
                         self.hass,
@@ -297,10 +319,51 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Optional("option", default="option1"): vol.In({
+                    vol.Optional("option", default="option0"): vol.In({
+                        "option0": "Оставить выбранные устройства.",
                         "option1": "Добавить все устройства.",
                         "option2": "Выбрать нужные устройства.",
-                    })
+                    }),
+                    vol.Optional(
+                        CONF_WEBHOOK_DEBOUNCE,
+                        default=self.data.get(
+                            CONF_WEBHOOK_DEBOUNCE, TIME_WEBHOOK_DEBOUNCE
+                        )
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_WEBHOOK_DEBOUNCE)
+                    ),
+                    vol.Optional(
+                        CONF_POLL_MIN_INTERVAL,
+                        default=self.data.get(
+                            CONF_POLL_MIN_INTERVAL, TIME_POLL_MIN
+                        )
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=1, max=LIMIT_POLL_INTERVAL)
+                    ),
+                    vol.Optional(
+                        CONF_POLL_MAX_INTERVAL,
+                        default=self.data.get(
+                            CONF_POLL_MAX_INTERVAL, TIME_POLL_MAX
+                        )
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=1, max=LIMIT_POLL_INTERVAL)
+                    ),
+                    vol.Optional(
+                        CONF_HEDGE_REQUESTS,
+                        default=self.data.get(CONF_HEDGE_REQUESTS, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_DECODE_EXECUTOR_SIZE,
+                        default=self.data.get(
+                            CONF_DECODE_EXECUTOR_SIZE, SIZE_DECODE_EXECUTOR
+                        )
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=LIMIT_DECODE_EXECUTOR)
+                    )
                 }
             ),
             errors=errors
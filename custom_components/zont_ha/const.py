@@ -1,14 +1,13 @@
-from homeassistant.const import (
-    UnitOfTemperature, UnitOfElectricPotential, PERCENTAGE, UnitOfPressure,
-    SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfVolumeFlowRate, UnitOfSpeed,
-    UnitOfVolume, UnitOfFrequency, UnitOfPower, UnitOfApparentPower,
-    UnitOfReactivePower, CONCENTRATION_PARTS_PER_MILLION, UnitOfEnergy
-)
-
 DOMAIN = 'zont_ha'
 MANUFACTURER = 'MicroLine''ab-log'
 ENTRIES = 'entries'
 CURRENT_ENTITY_IDS = 'current_entity_ids'
+RATE_LIMITERS = 'rate_limiters'
+SESSION = 'session'
+
+ATTR_DATA_AGE = 'data_age_s'
+ATTR_STALE = 'stale'
+
 CONFIGURATION_URL = 'https://my.zont.online/'
 
 ZONT_API_URL_ROOT = 'https://my.zont.online/api/'
@@ -23,43 +22,6 @@ URL_ACTIVATE_HEATING_MODE = ZONT_API_URL + 'activate_heating_mode'
 
 URL_TOKEN = ZONT_API_URL + 'authtokens'
 
-UNIT_BY_TYPE = {
-    'temperature': UnitOfTemperature.CELSIUS,
-    'humidity': PERCENTAGE,
-    'voltage': UnitOfElectricPotential.VOLT,
-    'modulation': PERCENTAGE,
-    'pressure': UnitOfPressure.BAR,
-    'leakage': UnitOfElectricPotential.VOLT,
-    'motion': UnitOfElectricPotential.VOLT,
-    'smoke': UnitOfElectricPotential.VOLT,
-    'opening': UnitOfElectricPotential.VOLT,
-    'room_thermostat': UnitOfElectricPotential.VOLT,
-    'power_source': UnitOfEnergy.KILO_WATT_HOUR,
-    'discrete': UnitOfElectricPotential.VOLT,
-    'signal_strength': SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    'battery': PERCENTAGE
-}
-
-VALID_UNITS = {
-    'л/мин': UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
-    'л': UnitOfVolume.LITERS,
-    'м³/ч': UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
-    'txt': None,
-    'дБм': SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    'бар': UnitOfPressure.BAR,
-    '°': UnitOfTemperature.CELSIUS,
-    '%': PERCENTAGE,
-    'В': UnitOfElectricPotential.VOLT,
-    'км/ч': UnitOfSpeed.KILOMETERS_PER_HOUR,
-    'Гц': UnitOfFrequency.HERTZ,
-    'Вт': UnitOfPower.WATT,
-    'ВА': UnitOfApparentPower.VOLT_AMPERE,
-    'ВАР': UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
-    'кВт•ч': UnitOfEnergy.KILO_WATT_HOUR,
-    'ppm': CONCENTRATION_PARTS_PER_MILLION,
-    'battery': PERCENTAGE
-}
-
 ZONT_SENSOR_TYPE = {
     'dhw_speed': 'volume_flow_rate'
 }
@@ -112,11 +74,63 @@ PLATFORMS = [
 ]
 
 COUNTER_REPEAT = 18
-COUNTER_CONNECT = 10
 TIME_OUT_UPDATE_DATA = 10
 TIME_OUT_REPEAT = 10
 TIME_OUT_REQUEST = 2
+TIME_OUT_CONFIRM = 15
+TIME_CONFIRM_STEP = 1
+TIME_CONFIRM_MAX_STEP = 4
 TIME_UPDATE = 60
+TIME_UPDATE_OLD = 3600
+TIME_WEBHOOK_DEBOUNCE = 3
+MAX_WEBHOOK_DEBOUNCE = 60
+TIME_COMMAND_COALESCE = 0.5
+MAX_COMMANDS_PER_DEVICE = 2
+TIME_POLL_MIN = 15
+TIME_POLL_MAX = 300
+LIMIT_POLL_INTERVAL = 3600
+TIME_POLL_BOOST = 60
+TIME_WEBHOOK_HEALTHY = 600
+STABLE_POLLS = 3
+POLL_JITTER = 0.2
+TIME_SNAPSHOT_SAVE = 30
+SNAPSHOT_VERSION = 1
+RATE_LIMIT = 1
+RATE_LIMIT_BURST = 5
+RETRY_ATTEMPTS = 2
+TIME_RETRY_BACKOFF = 1
+TIME_RETRY_MAX = 30
+BREAKER_THRESHOLD = 3
+TIME_BREAKER_OPEN = 60
+TIME_BREAKER_MAX_OPEN = 600
+TIME_OUT_PROBE = 5
+TIME_STALE_UNAVAILABLE = 900
+SESSION_LIMIT = 20
+SESSION_LIMIT_PER_HOST = 4
+TIME_KEEPALIVE = 60
+TIME_DNS_CACHE = 300
+TIME_OUT_SESSION = 30
+LATENCY_WINDOW = 100
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MAX_RATIO = 0.1
+TIME_HEDGE_MIN = 0.5
+TIMING_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # мс
+SIZE_DECODE_EXECUTOR = 256  # КБ
+LIMIT_DECODE_EXECUTOR = 16384  # КБ
+PROFILE_UPDATES = 5
+LIMIT_PROFILE_UPDATES = 100
+PROFILE_TOP = 20
+TIME_OUT_PROFILE = 600
+LIMIT_PROFILE_TIMEOUT = 3600
+LIMIT_PROFILE_TOP = 200
+
+CONF_WEBHOOK_DEBOUNCE = 'webhook_debounce'
+CONF_POLL_MIN_INTERVAL = 'poll_min_interval'
+CONF_POLL_MAX_INTERVAL = 'poll_max_interval'
+CONF_HEDGE_REQUESTS = 'hedge_requests'
+CONF_DECODE_EXECUTOR_SIZE = 'decode_executor_size'
+
+SERVICE_PROFILE_UPDATES = 'profile_updates'
 
 MODELS_THERMOSTAT_ZONT = ('T100', 'T102')
 PLUS = '+'
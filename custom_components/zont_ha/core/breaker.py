@@ -0,0 +1,123 @@
+import logging
+import time
+
+from ..const import (
+    BREAKER_THRESHOLD, TIME_BREAKER_OPEN, TIME_BREAKER_MAX_OPEN
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Предохранитель запросов к API.
+    После threshold ошибок подряд запросы не выполняются, пока не истечёт
+    время ожидания. Затем пропускается один пробный запрос: успех замыкает
+    предохранитель, ошибка размыкает его снова с удвоенным ожиданием.
+    """
+
+    def __init__(
+            self, threshold: int = BREAKER_THRESHOLD,
+            open_time: float = TIME_BREAKER_OPEN,
+            max_open_time: float = TIME_BREAKER_MAX_OPEN
+    ) -> None:
+        self.threshold = threshold
+        self.open_time = open_time
+        self.max_open_time = max_open_time
+        self._state: str = STATE_CLOSED
+        self._open_until: float = 0
+        self._current_open_time: float = open_time
+        self._probing: bool = False
+        self._failed_request: int | None = None
+        self.failures: int = 0
+        self.opened: int = 0
+        self.probes: int = 0
+        self.rejected: int = 0
+
+    @property
+    def state(self) -> str:
+        """Состояние: closed, open или half_open."""
+        if (self._state == STATE_OPEN
+                and time.monotonic() >= self._open_until):
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    @property
+    def probing(self) -> bool:
+        """Выполняется ли пробный запрос."""
+        return self._probing
+
+    @property
+    def retry_in(self) -> float:
+        """Время до пробного запроса, с."""
+        if self.state != STATE_OPEN:
+            return 0
+        return self._open_until - time.monotonic()
+
+    def allow(self) -> bool:
+        """Можно ли выполнить запрос сейчас."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            self.probes += 1
+            _LOGGER.debug('Пробный запрос к API zont')
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Учитывает успешный запрос."""
+        if self._state != STATE_CLOSED:
+            _LOGGER.info('API zont снова доступен')
+        self._state = STATE_CLOSED
+        self._probing = False
+        self._current_open_time = self.open_time
+        self.failures = 0
+
+    def record_failure(self, request: int | None = None) -> bool:
+        """
+        Учитывает неудачный запрос. request - номер общего запроса:
+        его ошибка, полученная несколькими вызовами, учитывается один
+        раз. Неудача пробного запроса учитывается всегда, иначе
+        предохранитель остался бы в пробном состоянии.
+        Возвращает, учтена ли ошибка.
+        """
+        if (request is not None and request == self._failed_request
+                and not self._probing):
+            return False
+        self._failed_request = request
+        self.failures += 1
+        if self._state == STATE_HALF_OPEN or self._probing:
+            self._current_open_time = min(
+                self._current_open_time * 2, self.max_open_time
+            )
+            self._open()
+        elif (self._state == STATE_CLOSED
+              and self.failures >= self.threshold):
+            self._open()
+        return True
+
+    def _open(self) -> None:
+        self._state = STATE_OPEN
+        self._probing = False
+        self._open_until = time.monotonic() + self._current_open_time
+        self.opened += 1
+        _LOGGER.warning(f'API zont недоступен, запросы приостановлены '
+                        f'на {self._current_open_time:.0f} с.')
+
+    def as_dict(self) -> dict[str, int | float | str]:
+        """Состояние предохранителя."""
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened': self.opened,
+            'probes': self.probes,
+            'rejected': self.rejected,
+            'retry_in': round(self.retry_in, 1),
+        }
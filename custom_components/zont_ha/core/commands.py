@@ -0,0 +1,167 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .models_zont_v3 import ButtonZONT
+from .profiler import profile_section
+from .stats import LatencyWindow
+from ..const import TIME_COMMAND_COALESCE, MAX_COMMANDS_PER_DEVICE
+
+_LOGGER = logging.getLogger(__name__)
+
+Send = Callable[[], Awaitable[Any]]
+
+
+class QueuedCommand:
+    """Команда, ожидающая отправки, и её общий результат."""
+
+    def __init__(self, send: Send) -> None:
+        self.send = send
+        self.future: asyncio.Future = (
+            asyncio.get_running_loop().create_future()
+        )
+        # Результат может никто не ждать, ошибку не логируем повторно.
+        self.future.add_done_callback(
+            lambda future: future.cancelled() or future.exception()
+        )
+
+
+class CommandQueue:
+    """
+    Очередь команд управления по устройствам.
+    Команды одного вида для одной цели (контур, кнопка, зона), пришедшие
+    до отправки за delay, схлопываются: отправляется только последняя,
+    а все вызовы получают её результат. Команды без ключа (нажатия
+    кнопок) отправляются без задержки. На одно устройство одновременно
+    отправляется не более limit команд.
+    """
+
+    def __init__(
+            self, delay: float = TIME_COMMAND_COALESCE,
+            limit: int = MAX_COMMANDS_PER_DEVICE
+    ) -> None:
+        self.delay = delay
+        self.limit = limit
+        self._waiting: dict[tuple, QueuedCommand] = {}
+        self._semaphores: dict[int, asyncio.Semaphore] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.submitted: int = 0
+        self.coalesced: int = 0
+        self.sent: int = 0
+        self.failed: int = 0
+        self.latency = LatencyWindow()
+
+    async def submit(
+            self, device_id: int, key: tuple | None, send: Send
+    ) -> Any:
+        """
+        Ставит команду в очередь устройства и ждёт её отправки.
+        Команды без ключа не схлопываются (например, нажатия кнопок).
+        """
+        self.submitted += 1
+        queued = self._waiting.get(key) if key is not None else None
+        if queued is not None:
+            queued.send = send
+            self.coalesced += 1
+            _LOGGER.debug(f'Команда {key} заменена более новой')
+        else:
+            queued = QueuedCommand(send)
+            if key is not None:
+                self._waiting[key] = queued
+            task = asyncio.ensure_future(
+                self._run(device_id, key, queued)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(queued.future)
+
+    async def _run(
+            self, device_id: int, key: tuple | None, queued: QueuedCommand
+    ) -> None:
+        """
+        Выжидает окно схлопывания и отправляет последнюю команду.
+        Команда без ключа не схлопывается и отправляется сразу.
+        """
+        try:
+            if key is not None:
+                await asyncio.sleep(self.delay)
+            semaphore = self._semaphores.setdefault(
+                device_id, asyncio.Semaphore(self.limit)
+            )
+            async with semaphore:
+                # Пока команда ждала слот, её ещё можно было заменить.
+                if key is not None and self._waiting.get(key) is queued:
+                    del self._waiting[key]
+                self.sent += 1
+                start = time.perf_counter()
+                result = await queued.send()
+                self.latency.record(time.perf_counter() - start)
+        except asyncio.CancelledError:
+            self._forget(key, queued)
+            queued.future.cancel()
+            raise
+        except Exception as err:
+            self._forget(key, queued)
+            self.failed += 1
+            queued.future.set_exception(err)
+            return
+        queued.future.set_result(result)
+
+    def _forget(self, key: tuple | None, queued: QueuedCommand) -> None:
+        if key is not None and self._waiting.get(key) is queued:
+            del self._waiting[key]
+
+    def cancel(self) -> None:
+        """Отменяет неотправленные команды."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Счётчики очереди команд."""
+        return {
+            'delay': self.delay,
+            'limit': self.limit,
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'sent': self.sent,
+            'failed': self.failed,
+            'waiting': len(self._waiting),
+            'latency': self.latency.as_dict(),
+        }
+
+
+def queued_command(kind: str, target: str | None = None):
+    """
+    Декоратор отправки команды Zont через очередь устройства.
+    target - имя аргумента с объектом команды. Команды вида kind для
+    одного объекта устройства схлопываются, без target - для устройства.
+    Нажатия кнопок без состояния не схлопываются.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(zont, *args, **kwargs):
+            arguments = signature.bind(zont, *args, **kwargs).arguments
+            device_id = arguments['device'].id
+            obj = arguments.get(target) if target is not None else None
+            if isinstance(obj, ButtonZONT):
+                key = None
+            else:
+                key = (device_id, kind, obj.id if obj is not None else None)
+
+            async def send():
+                try:
+                    with profile_section(zont.profiler, 'command'):
+                        return await func(zont, *args, **kwargs)
+                finally:
+                    # Идущий опрос мог начаться до применения команды.
+                    zont.mark_stale()
+
+            return await zont.commands.submit(device_id, key, send)
+        return wrapper
+    return decorator
@@ -0,0 +1,153 @@
+from collections import namedtuple
+from collections.abc import Collection
+
+from pydantic import TypeAdapter
+from pydantic_core import from_json
+
+from .models_zont_v3 import AccountZont, DeviceZONT
+
+DEVICES_ADAPTER = TypeAdapter(list[DeviceZONT])
+
+CachedDevice = namedtuple('CachedDevice', ['json', 'device'])
+DecodedAccount = namedtuple('DecodedAccount', [
+    'account', 'fresh', 'devices', 'generation', 'validated', 'reused'
+])
+
+
+def _load(body: bytes) -> dict:
+    data_json = from_json(body)
+    if not isinstance(data_json, dict):
+        raise ValueError('Ответ API V3 не объект JSON')
+    return data_json
+
+
+def _is_selected(
+        device_id, selected_devices: Collection[str] | None
+) -> bool:
+    return selected_devices is None or str(device_id) in selected_devices
+
+
+class AccountDecoder:
+    """
+    Декодер ответа API V3.
+    Разбирает байты ответа за один проход и валидирует только выбранные
+    устройства, JSON которых изменился с прошлого опроса. Неизменное
+    устройство определяется сравнением с разобранным JSON прошлого
+    опроса, для него переиспользуется ранее провалидированный
+    и дополненный DeviceZONT.
+    Разбор (parse) не меняет состояние декодера и может выполняться
+    в потоке исполнителя, новый кэш устанавливает commit в event loop.
+    """
+
+    def __init__(self) -> None:
+        self._devices: dict[int | str, CachedDevice] = {}
+        self._generation: int = 0
+        self._invalidated: dict[int | str | None, int] = {}
+        self.validated: int = 0
+        self.reused: int = 0
+
+    def __len__(self) -> int:
+        """Количество устройств в кэше."""
+        return len(self._devices)
+
+    def invalidate(self, device_id: int | str | None = None) -> None:
+        """
+        Сбрасывает кэш устройства (или всех устройств), чтобы оно было
+        заново провалидировано при следующем опросе. Сброс во время
+        разбора применяется и к кэшу, который установит commit.
+        """
+        self._generation += 1
+        self._invalidated[device_id] = self._generation
+        if device_id is None:
+            self._devices = {}
+        else:
+            self._devices = {
+                key: cached for key, cached in self._devices.items()
+                if key != device_id
+            }
+
+    def decode(
+            self, body: bytes, selected_devices: Collection[str] | None = None
+    ) -> tuple[AccountZont, list[DeviceZONT]]:
+        """
+        Возвращает снимок аккаунта и список заново провалидированных
+        устройств. None в selected_devices - выбраны все устройства.
+        """
+        return self.commit(self.parse(body, selected_devices))
+
+    def parse(
+            self, body: bytes, selected_devices: Collection[str] | None = None
+    ) -> DecodedAccount:
+        """
+        Разбор ответа без изменения состояния декодера.
+        Результат устанавливается в кэш методом commit.
+        """
+        generation = self._generation
+        previous = self._devices
+        data_json = _load(body)
+        cache = {}
+        devices = []
+        fresh = []
+        reused = 0
+        for device_json in data_json.get('devices') or []:
+            device_id = device_json.get('id')
+            if not _is_selected(device_id, selected_devices):
+                continue
+            cached = previous.get(device_id)
+            if cached is not None and cached.json == device_json:
+                device = cached.device
+                reused += 1
+            else:
+                device = DeviceZONT.model_validate(device_json)
+                fresh.append(device)
+            cache[device_id] = CachedDevice(device_json, device)
+            devices.append(device)
+        account = AccountZont.model_construct(
+            devices=devices, ok=data_json.get('ok', False)
+        )
+        return DecodedAccount(
+            account, fresh, cache, generation, len(fresh), reused
+        )
+
+    def commit(
+            self, result: DecodedAccount
+    ) -> tuple[AccountZont, list[DeviceZONT]]:
+        """
+        Устанавливает кэш разобранного ответа. Устройства, сброшенные
+        после начала разбора, в кэш не попадают.
+        """
+        self._invalidated = {
+            device_id: generation
+            for device_id, generation in self._invalidated.items()
+            if generation > result.generation
+        }
+        dropped = self._invalidated.keys()
+        self.validated += result.validated
+        self.reused += result.reused
+        if None in dropped:
+            self._devices = {}
+        else:
+            self._devices = {
+                device_id: cached
+                for device_id, cached in result.devices.items()
+                if device_id not in dropped
+            }
+        return result.account, result.fresh
+
+
+def decode_account(
+        body: bytes, selected_devices: Collection[str] | None = None
+) -> AccountZont:
+    """
+    Декодирует ответ API V3 из байтов сразу в модели выбранных устройств.
+    Невыбранные устройства не валидируются. None - выбраны все устройства.
+    """
+    data_json = _load(body)
+    devices = [
+        device for device in data_json.get('devices') or []
+        if _is_selected(device.get('id'), selected_devices)
+    ]
+    return AccountZont.model_construct(
+        devices=DEVICES_ADAPTER.validate_python(devices),
+        ok=data_json.get('ok', False)
+    )
@@ -0,0 +1,114 @@
+from .models_zont_v3 import AccountZont, ControlsZONT, DeviceZONT
+
+DEVICE_FIELDS = ('name', 'online')
+CONTROL_GROUPS = ('buttons', 'regulators', 'statuses', 'toggle_buttons')
+
+
+class ChangeSet:
+    """Набор изменений между двумя снимками аккаунта."""
+
+    def __init__(self) -> None:
+        self.devices: set[int] = set()
+        self.objects: set[tuple[int, int | str]] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.devices or self.objects)
+
+    def __len__(self) -> int:
+        return len(self.devices) + len(self.objects)
+
+    def __repr__(self) -> str:
+        return (f'<ChangeSet devices={len(self.devices)} '
+                f'objects={len(self.objects)}>')
+
+    def add_device(self, device_id: int) -> None:
+        """Помечает изменённым устройство целиком."""
+        self.devices.add(device_id)
+
+    def add_object(self, device_id: int, object_id: int | str) -> None:
+        """Помечает изменённым объект устройства."""
+        self.objects.add((device_id, object_id))
+
+    def update(self, other: 'ChangeSet') -> None:
+        """Добавляет изменения из другого набора."""
+        self.devices |= other.devices
+        self.objects |= other.objects
+
+    def is_changed(
+            self, device_id: int, object_id: int | str | None = None
+    ) -> bool:
+        """
+        Изменилось ли устройство или его объект.
+        Изменение самого устройства затрагивает все его объекты.
+        """
+        if device_id in self.devices:
+            return True
+        if object_id is None:
+            return False
+        return (device_id, object_id) in self.objects
+
+
+def _diff_items(
+        old_items: list, new_items: list, device_id: int, changes: ChangeSet
+) -> bool:
+    """Сравнивает списки объектов устройства по их id."""
+    changed = False
+    old_by_id = {item.id: item for item in old_items}
+    for item in new_items:
+        previous = old_by_id.pop(item.id, None)
+        if previous is item:
+            continue
+        if previous is None or previous != item:
+            changes.add_object(device_id, item.id)
+            changed = True
+    for item_id in old_by_id:
+        changes.add_object(device_id, item_id)
+        changed = True
+    return changed
+
+
+def diff_device(old: DeviceZONT, new: DeviceZONT, changes: ChangeSet) -> None:
+    """Добавляет в набор изменения одного устройства."""
+    if old is new:
+        return
+    device_id = new.id
+    if any(getattr(old, field) != getattr(new, field)
+           for field in DEVICE_FIELDS):
+        changes.add_device(device_id)
+        return
+    _diff_items(old.circuits, new.circuits, device_id, changes)
+    _diff_items(old.sensors, new.sensors, device_id, changes)
+    _diff_items(old.guard_zones, new.guard_zones, device_id, changes)
+    old_controls = old.controls or ControlsZONT()
+    new_controls = new.controls or ControlsZONT()
+    for group in CONTROL_GROUPS:
+        _diff_items(
+            getattr(old_controls, group), getattr(new_controls, group),
+            device_id, changes
+        )
+    if _diff_items(old.modes, new.modes, device_id, changes):
+        # Список режимов отображается в каждом контуре.
+        for circuit in new.circuits:
+            changes.add_object(device_id, circuit.id)
+
+
+def diff_account(
+        old: AccountZont | None, new: AccountZont
+) -> ChangeSet | None:
+    """
+    Сравнивает предыдущий и новый снимки аккаунта.
+    Возвращает None, если предыдущего снимка нет и изменилось всё.
+    """
+    if old is None:
+        return None
+    changes = ChangeSet()
+    old_devices = {device.id: device for device in old.devices}
+    for device in new.devices:
+        previous = old_devices.pop(device.id, None)
+        if previous is None:
+            changes.add_device(device.id)
+            continue
+        diff_device(previous, device, changes)
+    for device_id in old_devices:
+        changes.add_device(device_id)
+    return changes
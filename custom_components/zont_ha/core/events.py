@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+
+from .models_zont_webhook import DeviceEventWebhook
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WebhookCoalescer:
+    """
+    Очередь событий webhook одной записи интеграции.
+    События, пришедшие в пределах окна, объединяются в одно обновление
+    данных аккаунта. create_task запускает обновление, например
+    фоновой задачей записи.
+    """
+
+    def __init__(
+            self, refresh: Callable[[], Coroutine], window: float,
+            create_task: Callable[[Coroutine], asyncio.Task] = (
+                asyncio.ensure_future
+            )
+    ) -> None:
+        self._refresh = refresh
+        self._create_task = create_task
+        self.window = window
+        self._pending: list[DeviceEventWebhook] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self.received: int = 0
+        self.merged: int = 0
+        self.dropped: int = 0
+        self.refreshes: int = 0
+
+    def push(self, event: DeviceEventWebhook) -> None:
+        """Ставит событие в очередь и планирует обновление по окну."""
+        self.received += 1
+        if self._pending:
+            self.merged += 1
+        self._pending.append(event)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+
+    def drop(self) -> None:
+        """Учитывает отброшенное событие (чужое устройство или ошибка)."""
+        self.received += 1
+        self.dropped += 1
+
+    def _flush(self) -> None:
+        """Выполняет одно обновление на все события окна."""
+        self._timer = None
+        events, self._pending = self._pending, []
+        _LOGGER.debug(f'Обработка {len(events)} событий webhook '
+                      f'одним обновлением')
+        self.refreshes += 1
+        self._task = self._create_task(self._refresh())
+
+    def cancel(self) -> None:
+        """Отменяет запланированное обновление."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._pending = []
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Счётчики очереди webhook."""
+        return {
+            'window': self.window,
+            'received': self.received,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'refreshes': self.refreshes,
+            'pending': len(self._pending),
+        }
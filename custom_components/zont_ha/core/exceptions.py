@@ -26,6 +26,11 @@ class ResponseZontError(HomeAssistantError):
     pass
 
 
+class ThrottledZontError(ResponseZontError):
+    """API zont ограничил частоту запросов (ответ 429)."""
+    pass
+
+
 class SetHvacModeError(HomeAssistantError):
     """Ошибка изменения HVAC mode"""
     pass
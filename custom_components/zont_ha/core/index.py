@@ -0,0 +1,62 @@
+from .models_zont_v3 import (
+    AccountZont, DeviceZONT, SensorZONT, CircuitZONT, GuardZoneZONT,
+    HeatingModeZONT, StatusZONT, ToggleButtonsZONT, ButtonZONT
+)
+
+
+class AccountIndex:
+    """
+    Индексы объектов снимка аккаунта по id.
+    Строятся один раз на каждое обновление данных, после чего поиск
+    объектов сущностями выполняется за O(1).
+    """
+
+    def __init__(self, account: AccountZont | None = None) -> None:
+        self.devices: dict[int, DeviceZONT] = {}
+        self.sensors: dict[tuple[int, int | str], SensorZONT] = {}
+        self.circuits: dict[tuple[int, int | str], CircuitZONT] = {}
+        self.guard_zones: dict[tuple[int, int | str], GuardZoneZONT] = {}
+        self.modes_by_id: dict[tuple[int, int | str], HeatingModeZONT] = {}
+        self.modes_by_name: dict[tuple[int, str], HeatingModeZONT] = {}
+        self.statuses: dict[tuple[int, int | str], StatusZONT] = {}
+        self.toggle_buttons: dict[
+            tuple[int, int | str], ToggleButtonsZONT] = {}
+        self.buttons: dict[tuple[int, int | str], ButtonZONT] = {}
+        if account is not None:
+            for device in account.devices:
+                self.add_device(device)
+
+    def __len__(self) -> int:
+        return (
+            len(self.devices) + len(self.sensors) + len(self.circuits)
+            + len(self.guard_zones) + len(self.modes_by_id)
+            + len(self.statuses) + len(self.toggle_buttons)
+            + len(self.buttons)
+        )
+
+    def add_device(self, device: DeviceZONT) -> None:
+        """
+        Индексирует устройство и его объекты.
+        При совпадении id остаётся первый объект, как и при поиске по списку.
+        """
+        device_id = device.id
+        self.devices.setdefault(device_id, device)
+        for sensor in device.sensors:
+            self.sensors.setdefault((device_id, sensor.id), sensor)
+        for circuit in device.circuits:
+            self.circuits.setdefault((device_id, circuit.id), circuit)
+        for guard_zone in device.guard_zones:
+            self.guard_zones.setdefault((device_id, guard_zone.id), guard_zone)
+        for mode in device.modes:
+            self.modes_by_id.setdefault((device_id, mode.id), mode)
+            self.modes_by_name.setdefault((device_id, mode.name), mode)
+        if device.controls is None:
+            return
+        for status in device.controls.statuses:
+            self.statuses.setdefault((device_id, status.id), status)
+        for toggle_button in device.controls.toggle_buttons:
+            self.toggle_buttons.setdefault(
+                (device_id, toggle_button.id), toggle_button
+            )
+        for button in device.controls.buttons:
+            self.buttons.setdefault((device_id, button.id), button)
@@ -0,0 +1,127 @@
+from typing import Any
+
+from .delta import ChangeSet
+from .index import AccountIndex
+
+
+class PendingValue:
+    """
+    Значение атрибута объекта, заданное командой и ещё не подтверждённое
+    API. kind - имя индекса объекта в AccountIndex (circuits, guard_zones,
+    toggle_buttons). accepted - значения API, подтверждающие команду.
+    """
+
+    def __init__(
+            self, kind: str, device_id: int, object_id: int | str,
+            attr: str, value: Any, accepted: tuple | None = None
+    ) -> None:
+        self.kind = kind
+        self.device_id = device_id
+        self.object_id = object_id
+        self.attr = attr
+        self.value = value
+        self.accepted = accepted if accepted is not None else (value,)
+        self.server_value: Any = None
+        self.confirmed: bool = False
+        self.superseded: bool = False
+
+    @property
+    def done(self) -> bool:
+        """Значение подтверждено или заменено более новой командой."""
+        return self.confirmed or self.superseded
+
+    @property
+    def key(self) -> tuple:
+        """Объект и атрибут, к которым относится значение."""
+        return self.kind, self.device_id, self.object_id, self.attr
+
+    def __repr__(self) -> str:
+        return (f'<PendingValue {self.kind} {self.device_id}/'
+                f'{self.object_id} {self.attr}={self.value}>')
+
+    def get_object(self, index: AccountIndex):
+        """Объект команды в снимке аккаунта."""
+        return getattr(index, self.kind).get((self.device_id, self.object_id))
+
+
+class PendingCommands:
+    """
+    Оптимистичные значения объектов.
+    Пока команда не подтверждена, значение накладывается на каждый новый
+    снимок аккаунта, чтобы интерфейс не возвращался к старому значению.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[PendingValue] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def for_device(self, device_id: int) -> list[PendingValue]:
+        """Неподтверждённые значения устройства."""
+        return [
+            pending for pending in self._pending
+            if pending.device_id == device_id
+        ]
+
+    @property
+    def devices(self) -> set[int]:
+        """Устройства с неподтверждёнными командами."""
+        return {pending.device_id for pending in self._pending}
+
+    def add(
+            self, pending: PendingValue, index: AccountIndex
+    ) -> ChangeSet:
+        """
+        Добавляет значение и сразу применяет его к текущему снимку.
+        Значение для отсутствующего объекта не отслеживается.
+        """
+        changes = ChangeSet()
+        obj = pending.get_object(index)
+        if obj is None:
+            pending.confirmed = True
+            return changes
+        pending.server_value = getattr(obj, pending.attr)
+        for item in list(self._pending):
+            if item.key == pending.key:
+                # Значение API сохраняется от первой команды серии.
+                item.superseded = True
+                self._pending.remove(item)
+                pending.server_value = item.server_value
+        self._pending.append(pending)
+        setattr(obj, pending.attr, pending.value)
+        changes.add_object(pending.device_id, pending.object_id)
+        return changes
+
+    def apply(self, index: AccountIndex) -> None:
+        """
+        Накладывает неподтверждённые значения на новый снимок.
+        Значения, которые API уже вернул, считаются подтверждёнными.
+        """
+        for pending in list(self._pending):
+            obj = pending.get_object(index)
+            if obj is None:
+                # Объект удалён из аккаунта, подтверждать нечего.
+                pending.superseded = True
+                self._pending.remove(pending)
+                continue
+            server_value = getattr(obj, pending.attr)
+            if server_value in pending.accepted:
+                pending.confirmed = True
+                self._pending.remove(pending)
+                continue
+            pending.server_value = server_value
+            setattr(obj, pending.attr, pending.value)
+
+    def revert(
+            self, pending: PendingValue, index: AccountIndex
+    ) -> ChangeSet:
+        """Снимает неподтверждённое значение и возвращает значение API."""
+        changes = ChangeSet()
+        if pending in self._pending:
+            self._pending.remove(pending)
+            obj = pending.get_object(index)
+            if obj is not None:
+                setattr(obj, pending.attr, pending.server_value)
+                changes.add_object(pending.device_id, pending.object_id)
+        return changes
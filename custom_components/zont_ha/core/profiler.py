@@ -0,0 +1,104 @@
+import asyncio
+import cProfile
+import logging
+import pstats
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager
+
+from ..const import PROFILE_TOP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UpdateProfiler:
+    """
+    Профилирование cProfile обновлений координатора, webhook и команд.
+    Профиль включается на время участков section() и выключается после
+    последнего из них. Пока участок ждёт ответа API, в профиль попадает
+    и остальная работа event loop. Разбор ответа в потоке исполнителя
+    cProfile не видит.
+    Профилирование завершается после updates обновлений координатора.
+    """
+
+    KINDS = ('update', 'dispatch', 'webhook', 'command')
+
+    def __init__(self, updates: int) -> None:
+        self.updates = updates
+        self.profile = cProfile.Profile()
+        self.counts: dict[str, int] = dict.fromkeys(self.KINDS, 0)
+        self.started: float = time.perf_counter()
+        self.elapsed: float | None = None
+        self.error: str | None = None
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._depth: int = 0
+
+    @contextmanager
+    def section(self, kind: str) -> Iterator[None]:
+        """Участок, который попадает в профиль."""
+        if self.done.done():
+            yield
+            return
+        if self._depth == 0:
+            try:
+                self.profile.enable()
+            except ValueError as err:
+                # Уже работает другой профилировщик (например profiler HA).
+                self.error = str(err)
+                _LOGGER.warning(f'Профилирование невозможно: {err}')
+                self.stop()
+                yield
+                return
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+            self.counts[kind] += 1
+            if kind == 'update' and self.counts[kind] >= self.updates:
+                self.stop()
+
+    def stop(self) -> None:
+        """Завершает профилирование. Идущие участки дописываются."""
+        if self.done.done():
+            return
+        self.elapsed = time.perf_counter() - self.started
+        if self._depth:
+            self.profile.disable()
+        self.done.set_result(None)
+
+    def summary(self, top: int = PROFILE_TOP,
+                sort: str = 'cumulative') -> dict[str, Any]:
+        """Число участков и top функций профиля по sort."""
+        functions = []
+        if any(self.counts.values()):
+            stats = pstats.Stats(self.profile).strip_dirs().sort_stats(sort)
+            for func in stats.fcn_list[:top]:
+                calls, total_calls, tottime, cumtime, _ = stats.stats[func]
+                functions.append({
+                    'function': pstats.func_std_string(func),
+                    'calls': total_calls,
+                    'primitive_calls': calls,
+                    'tottime_ms': round(tottime * 1000, 3),
+                    'cumtime_ms': round(cumtime * 1000, 3),
+                })
+        return {
+            'counts': dict(self.counts),
+            'elapsed_s': (
+                round(self.elapsed, 1) if self.elapsed is not None else None
+            ),
+            'sort': sort,
+            'top': functions,
+        }
+
+
+def profile_section(
+        profiler: UpdateProfiler | None, kind: str
+) -> ContextManager:
+    """Участок профиля или пустой контекст без профилирования."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.section(kind)
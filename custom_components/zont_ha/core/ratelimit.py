@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from email.utils import parsedate_to_datetime
+
+from aiohttp import ClientResponse
+
+from ..const import RATE_LIMIT, RATE_LIMIT_BURST
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_BACKGROUND = 2
+
+
+def get_retry_after(response: ClientResponse) -> float | None:
+    """Задержка из заголовка Retry-After (секунды или HTTP-дата)."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - time.time())
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов к API одного аккаунта.
+    Запросы, которым не хватило токена, ждут в очереди по приоритету:
+    команды пользователя обслуживаются раньше фоновых опросов.
+    """
+
+    def __init__(
+            self, rate: float = RATE_LIMIT, capacity: float = RATE_LIMIT_BURST
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.acquired: int = 0
+        self.delayed: int = 0
+        self.paused: int = 0
+        self.wait_total: float = 0
+        self.wait_max: float = 0
+        self.max_queue_depth: int = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество запросов, ожидающих токен."""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @property
+    def paused_for(self) -> float:
+        """Сколько ещё длится пауза после ответа 429, с."""
+        return max(0.0, self._updated - time.monotonic())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(
+                self.capacity, self._tokens + elapsed * self.rate
+            )
+            self._updated = now
+
+    def _delay(self) -> float:
+        """Время до появления следующего токена."""
+        return self.paused_for + max(0.0, 1 - self._tokens) / self.rate
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> float:
+        """Ждёт токен для запроса. Возвращает время ожидания, с."""
+        self._refill()
+        self.acquired += 1
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (priority, next(self._counter), future)
+        )
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._schedule()
+        await future
+        waited = time.monotonic() - start
+        self.delayed += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return waited
+
+    def pause(self, delay: float) -> None:
+        """
+        Приостанавливает выдачу токенов на delay секунд, например
+        по Retry-After ответа 429.
+        """
+        self._refill()
+        self.paused += 1
+        self._tokens = min(self._tokens, 0)
+        self._updated = max(self._updated, time.monotonic() + delay)
+
+    def _schedule(self) -> None:
+        if self._timer is None and self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._delay(), self._release
+            )
+
+    def _release(self) -> None:
+        """Раздаёт накопившиеся токены ожидающим по приоритету."""
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            *_, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Ожидание отменено (например, по таймауту опроса).
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule()
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Счётчики ограничителя запросов."""
+        self._refill()
+        return {
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'tokens': round(self._tokens, 3),
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'acquired': self.acquired,
+            'delayed': self.delayed,
+            'paused': self.paused,
+            'wait_total': round(self.wait_total, 3),
+            'wait_max': round(self.wait_max, 3),
+            'wait_avg': round(
+                self.wait_total / self.delayed if self.delayed else 0, 3
+            ),
+        }
@@ -0,0 +1,106 @@
+import logging
+import random
+import time
+from collections.abc import Callable
+
+from ..const import (
+    TIME_UPDATE, TIME_POLL_MIN, TIME_POLL_MAX, TIME_POLL_BOOST,
+    TIME_WEBHOOK_HEALTHY, STABLE_POLLS, POLL_JITTER
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Адаптивный интервал опроса API.
+    Опрос ускоряется после команд и во время переходных состояний,
+    замедляется, пока приходят webhook и данные не меняются, и
+    экспоненциально (со случайным разбросом) откладывается при ошибках.
+    Интервал всегда остаётся в пределах min_interval..max_interval.
+    """
+
+    def __init__(
+            self, min_interval: float = TIME_POLL_MIN,
+            max_interval: float = TIME_POLL_MAX,
+            in_transition: Callable[[], bool] | None = None
+    ) -> None:
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.base_interval = self._clamp(TIME_UPDATE)
+        self._in_transition = in_transition
+        self._boost_until: float = 0
+        self._last_webhook: float | None = None
+        self.errors: int = 0
+        self.stable_polls: int = 0
+        self.interval: float = self.base_interval
+        self.reason: str = 'base'
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def record_success(self, changed: bool) -> None:
+        """Учитывает успешный опрос: изменились ли данные."""
+        self.errors = 0
+        self.stable_polls = 0 if changed else self.stable_polls + 1
+
+    def record_error(self) -> None:
+        """Учитывает неудачный опрос."""
+        self.errors += 1
+
+    def record_webhook(self) -> None:
+        """Учитывает входящее событие webhook."""
+        self._last_webhook = time.monotonic()
+
+    def boost(self, duration: float = TIME_POLL_BOOST) -> None:
+        """Ускоряет опрос на duration секунд (после команды)."""
+        self._boost_until = max(
+            self._boost_until, time.monotonic() + duration
+        )
+
+    @property
+    def webhooks_healthy(self) -> bool:
+        """Приходили ли события webhook в последнее время."""
+        return (self._last_webhook is not None
+                and time.monotonic() - self._last_webhook
+                <= TIME_WEBHOOK_HEALTHY)
+
+    def next_interval(self) -> float:
+        """Вычисляет интервал до следующего опроса."""
+        if self.errors:
+            backoff = self.base_interval * 2 ** (self.errors - 1)
+            # Разброс после ограничения сверху, чтобы опросы нескольких
+            # аккаунтов не совпадали и на максимальном интервале.
+            interval = (self._clamp(backoff)
+                        * random.uniform(1 - POLL_JITTER, 1))
+            reason = 'error'
+        elif (time.monotonic() < self._boost_until
+              or (self._in_transition is not None
+                  and self._in_transition())):
+            interval = self.min_interval
+            reason = 'boost'
+        elif self.webhooks_healthy and self.stable_polls >= STABLE_POLLS:
+            steps = self.stable_polls - STABLE_POLLS + 1
+            interval = self.base_interval * 2 ** min(steps, 8)
+            reason = 'stable'
+        else:
+            interval = self.base_interval
+            reason = 'base'
+        interval = self._clamp(interval)
+        if interval != self.interval or reason != self.reason:
+            _LOGGER.debug(f'Интервал опроса {interval:.1f} с. ({reason})')
+        self.interval = interval
+        self.reason = reason
+        return interval
+
+    def as_dict(self) -> dict[str, int | float | str | bool]:
+        """Состояние планировщика опроса."""
+        return {
+            'interval': self.interval,
+            'reason': self.reason,
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'errors': self.errors,
+            'stable_polls': self.stable_polls,
+            'webhooks_healthy': self.webhooks_healthy,
+        }
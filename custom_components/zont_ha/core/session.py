@@ -0,0 +1,97 @@
+import logging
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from ..const import (
+    DOMAIN, SESSION, SESSION_LIMIT, SESSION_LIMIT_PER_HOST,
+    TIME_KEEPALIVE, TIME_DNS_CACHE, TIME_OUT_SESSION
+)
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
+
+_LOGGER = logging.getLogger(__name__)
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+
+
+def create_session() -> ClientSession:
+    """
+    Сессия для API ZONT: постоянные соединения с my.zont.online,
+    кэш DNS и сжатие ответов.
+    """
+    connector = TCPConnector(
+        limit=SESSION_LIMIT,
+        limit_per_host=SESSION_LIMIT_PER_HOST,
+        keepalive_timeout=TIME_KEEPALIVE,
+        ttl_dns_cache=TIME_DNS_CACHE,
+        enable_cleanup_closed=True,
+    )
+    return ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=TIME_OUT_SESSION),
+        headers={
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'User-Agent': SERVER_SOFTWARE,
+        },
+    )
+
+
+class SharedSession:
+    """
+    Сессия, общая для всех записей интеграции.
+    Создаётся при первом использовании и закрывается, когда её отпускает
+    последняя запись или при остановке Home Assistant.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.session: ClientSession = create_session()
+        self.users: int = 0
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_event
+        )
+
+    async def _async_close_event(self, event: Event) -> None:
+        self._unsub_close = None
+        await self.session.close()
+
+    async def async_close(self) -> None:
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self.session.close()
+
+
+@callback
+def _get_shared(hass: HomeAssistant) -> SharedSession:
+    data = hass.data.setdefault(DOMAIN, {})
+    shared: SharedSession | None = data.get(SESSION)
+    if shared is None or shared.session.closed:
+        shared = data[SESSION] = SharedSession(hass)
+        _LOGGER.debug('Создана сессия для API zont')
+    return shared
+
+
+@callback
+def async_acquire_session(hass: HomeAssistant) -> ClientSession:
+    """Сессия интеграции для записи. Отпускается async_release_session."""
+    shared = _get_shared(hass)
+    shared.users += 1
+    return shared.session
+
+
+async def async_release_session(hass: HomeAssistant) -> None:
+    """Отпускает сессию записи и закрывает её после последней записи."""
+    shared: SharedSession | None = hass.data.get(DOMAIN, {}).get(SESSION)
+    if shared is None:
+        return
+    shared.users -= 1
+    if shared.users <= 0:
+        hass.data[DOMAIN].pop(SESSION, None)
+        await shared.async_close()
+        _LOGGER.debug('Сессия для API zont закрыта')
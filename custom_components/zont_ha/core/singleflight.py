@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _consume(task: asyncio.Future) -> None:
+    """Помечает ошибку задачи полученной, даже если её никто не ждёт."""
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """
+    Не более одного запроса данных в полёте.
+    Вызов во время запроса присоединяется к нему, если с его начала данные
+    не устарели (mark_stale). Иначе планируется ровно один повторный
+    запрос, к которому присоединяются все следующие вызовы.
+    """
+
+    def __init__(
+            self, fetch: Callable[[], Awaitable], timeout: float
+    ) -> None:
+        self._fetch = fetch
+        self.timeout = timeout
+        self._task: asyncio.Task | None = None
+        self._task_generation: int = 0
+        self._follow_up: asyncio.Task | None = None
+        self.generation: int = 0
+        self.requests: int = 0
+        self.fetches: int = 0
+        self.attached: int = 0
+        self.follow_ups: int = 0
+
+    @property
+    def deduplicated(self) -> int:
+        """Вызовы, не породившие отдельного HTTP-запроса."""
+        return self.requests - self.fetches
+
+    def mark_stale(self) -> None:
+        """
+        Данные на сервере изменились (команда, событие webhook):
+        идущий запрос мог их не застать.
+        """
+        self.generation += 1
+
+    def _start(self) -> asyncio.Task:
+        self.fetches += 1
+        self._task_generation = self.generation
+        task = asyncio.ensure_future(
+            asyncio.wait_for(self._fetch(), self.timeout)
+        )
+        task.add_done_callback(_consume)
+        task.add_done_callback(self._finished)
+        self._task = task
+        return task
+
+    def _finished(self, task: asyncio.Task) -> None:
+        if self._task is task:
+            self._task = None
+
+    async def _run_follow_up(self, previous: asyncio.Task) -> None:
+        """Повторный запрос после завершения текущего."""
+        try:
+            await asyncio.shield(previous)
+        except Exception:
+            pass
+        self._follow_up = None
+        await asyncio.shield(self._start())
+
+    async def run(self) -> None:
+        """Выполняет запрос или присоединяется к идущему."""
+        self.requests += 1
+        if self._follow_up is not None:
+            self.attached += 1
+            await asyncio.shield(self._follow_up)
+            return
+        if self._task is None or self._task.done():
+            await asyncio.shield(self._start())
+            return
+        if self._task_generation == self.generation:
+            self.attached += 1
+            await asyncio.shield(self._task)
+            return
+        self.follow_ups += 1
+        _LOGGER.debug('Данные устарели во время запроса, '
+                      'запланирован повторный запрос')
+        follow_up = asyncio.ensure_future(self._run_follow_up(self._task))
+        follow_up.add_done_callback(_consume)
+        self._follow_up = follow_up
+        await asyncio.shield(follow_up)
+
+    def cancel(self) -> None:
+        """Отменяет идущий и запланированный запросы."""
+        for task in (self._follow_up, self._task):
+            if task is not None:
+                task.cancel()
+        self._follow_up = None
+        self._task = None
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Счётчики запросов данных."""
+        return {
+            'requests': self.requests,
+            'fetches': self.fetches,
+            'attached': self.attached,
+            'follow_ups': self.follow_ups,
+            'deduplicated': self.deduplicated,
+        }
@@ -0,0 +1,69 @@
+import json
+import logging
+from collections.abc import Collection
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from ..const import DOMAIN, SNAPSHOT_VERSION, TIME_SNAPSHOT_SAVE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def selected_payload(raw: bytes | str, selected: Collection[str]) -> str:
+    """Ответ API только с выбранными устройствами (пусто - все)."""
+    data = json.loads(raw)
+    if selected and isinstance(data, dict):
+        data['devices'] = [
+            device for device in data.get('devices') or []
+            if str(device.get('id')) in selected
+        ]
+    return json.dumps(data, ensure_ascii=False)
+
+
+class SnapshotStore:
+    """
+    Последние ответы API записи интеграции в хранилище Home Assistant.
+    Сохраняются ответы V3 и V1 только с выбранными устройствами, поэтому
+    при тёплом старте данные проходят тот же путь разбора, что и при
+    обычном опросе.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, zont=None) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_VERSION, f'{DOMAIN}.{entry_id}'
+        )
+        self._zont = zont
+        self.saves: int = 0
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Загружает сохранённый снимок."""
+        try:
+            return await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning(f'Не удалось загрузить сохранённые данные: {err}')
+            return None
+
+    def async_schedule_save(self) -> None:
+        """Откладывает запись, чтобы частые опросы не писали на диск."""
+        if self._zont is None or self._zont.raw_v3 is None:
+            return
+        self._store.async_delay_save(self._data_to_save, TIME_SNAPSHOT_SAVE)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self.saves += 1
+        zont = self._zont
+        selected = set(zont.selected_devices)
+        return {
+            'updated_at': zont.updated_at,
+            'v3': selected_payload(zont.raw_v3, selected),
+            'v1': (
+                selected_payload(zont.raw_v1, selected)
+                if zont.raw_v1 else zont.raw_v1
+            ),
+        }
+
+    async def async_remove(self) -> None:
+        """Удаляет снимок вместе с записью интеграции."""
+        await self._store.async_remove()
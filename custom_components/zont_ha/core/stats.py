@@ -0,0 +1,101 @@
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from ..const import LATENCY_WINDOW
+
+
+class LatencyWindow:
+    """Скользящее окно последних длительностей для расчёта перцентилей."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self._values: deque[float] = deque(maxlen=size)
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def record(self, value: float) -> None:
+        """Добавляет длительность, с."""
+        self._values.append(value)
+        self.count += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Перцентиль по окну (ближайший ранг), None - окно пустое."""
+        if not self._values:
+            return None
+        values = sorted(self._values)
+        rank = max(0, int(round(percent / 100 * len(values))) - 1)
+        return values[min(rank, len(values) - 1)]
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """p50/p95/p99 окна в миллисекундах."""
+        result: dict[str, float | int | None] = {'count': self.count}
+        for percent in (50, 95, 99):
+            value = self.percentile(percent)
+            result[f'p{percent}_ms'] = (
+                round(value * 1000, 3) if value is not None else None
+            )
+        return result
+
+
+class PollStats:
+    """
+    Скользящая статистика обновлений координатора: длительность,
+    задержка API, размер ответа и число уведомлённых сущностей.
+    Слушатели вызываются после каждой записи, например для обновления
+    диагностических сенсоров.
+    """
+
+    METRICS = ('duration', 'latency', 'payload', 'notified')
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self.windows: dict[str, LatencyWindow] = {
+            metric: LatencyWindow(size) for metric in self.METRICS
+        }
+        self.last: dict[str, float] = {}
+        self.failures: int = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    def record(self, **values: float) -> None:
+        """Учитывает значения метрик одного обновления."""
+        for metric, value in values.items():
+            self.windows[metric].record(value)
+            self.last[metric] = value
+
+    def record_failure(self) -> None:
+        """Учитывает неудачное обновление."""
+        self.failures += 1
+
+    def percentiles(self, metric: str) -> dict[str, float | None]:
+        """p50/p95/p99 метрики по окну."""
+        window = self.windows[metric]
+        return {
+            f'p{percent}': window.percentile(percent)
+            for percent in (50, 95, 99)
+        }
+
+    def add_listener(
+            self, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Добавляет слушателя. Возвращает функцию для его удаления."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Последние значения и перцентили метрик."""
+        return {
+            **{
+                metric: {
+                    'last': self.last.get(metric),
+                    **self.percentiles(metric),
+                    'count': self.windows[metric].count,
+                }
+                for metric in self.METRICS
+            },
+            'failures': self.failures,
+        }
@@ -0,0 +1,64 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from ..const import TIMING_BUCKETS
+
+
+class PhaseTimer:
+    """
+    Длительность этапов работы: последнее значение, сумма, количество
+    и гистограмма по границам TIMING_BUCKETS.
+    """
+
+    def __init__(self) -> None:
+        self.last: dict[str, float] = {}
+        self.total: dict[str, float] = {}
+        self.count: dict[str, int] = {}
+        self.histogram: dict[str, list[int]] = {}
+
+    def record(self, phase: str, duration: float) -> None:
+        """Учитывает длительность этапа, с."""
+        self.total[phase] = self.total.get(phase, 0) + duration
+        self.count[phase] = self.count.get(phase, 0) + 1
+        buckets = self.histogram.setdefault(
+            phase, [0] * (len(TIMING_BUCKETS) + 1)
+        )
+        buckets[bisect_left(TIMING_BUCKETS, duration * 1000)] += 1
+        # Последним: по ключам last строится as_dict.
+        self.last[phase] = duration
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Замеряет длительность блока кода как этап phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def _histogram(self, phase: str) -> dict[str, int]:
+        """Количество замеров по интервалам, мс."""
+        buckets = self.histogram[phase]
+        result = {
+            f'<={bound}': count
+            for bound, count in zip(TIMING_BUCKETS, buckets)
+        }
+        result[f'>{TIMING_BUCKETS[-1]}'] = buckets[-1]
+        return result
+
+    def as_dict(self) -> dict[str, dict[str, float | int]]:
+        """Длительности этапов в миллисекундах."""
+        return {
+            phase: {
+                'last_ms': round(self.last[phase] * 1000, 3),
+                'avg_ms': round(
+                    self.total[phase] / self.count[phase] * 1000, 3
+                ),
+                'count': self.count[phase],
+                'histogram': self._histogram(phase),
+            }
+            # Копия ключей: этапы разбора пишутся и из потока исполнителя.
+            for phase in list(self.last)
+        }
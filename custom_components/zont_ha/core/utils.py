@@ -1,3 +1,4 @@
+import functools
 import logging
 from http import HTTPStatus
 
@@ -7,9 +8,9 @@ from .enums import TypeOfSensor
 from .exceptions import ResponseZontError
 from .models_zont_v3 import SensorZONT, DeviceZONT
 from ..const import (
-    HEATING_MODES, VALID_TYPE_SENSOR, ZONT_SENSOR_TYPE, UNIT_BY_TYPE,
-    VALID_UNITS, BINARY_SENSOR_TYPES
+    HEATING_MODES, VALID_TYPE_SENSOR, ZONT_SENSOR_TYPE, BINARY_SENSOR_TYPES
 )
+from ..units import UNIT_BY_TYPE, VALID_UNITS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ def check_send_command(func):
     Декоратор для проверки успешной отправки команды
     управления параметрами контроллера zont.
     """
+    @functools.wraps(func)
     async def check_response(*args, **kwargs):
         device: DeviceZONT = kwargs.get('device')
         circuit = kwargs.get('circuit')
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Coroutine
+
+from ..const import COUNTER_REPEAT, TIME_OUT_REPEAT, TIME_OUT_REQUEST
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GuardTransitionWatcher:
+    """
+    Единый цикл ускоренного опроса для всех охранных зон аккаунта.
+    Работает, пока хотя бы одна зона ставится на охрану или снимается
+    с охраны. Интервал опроса растёт экспоненциально. create_task
+    запускает цикл опроса, например фоновой задачей записи.
+    """
+
+    def __init__(
+            self, refresh: Callable[[], Awaitable],
+            in_transition: Callable[[], bool],
+            create_task: Callable[[Coroutine], asyncio.Task] = (
+                asyncio.ensure_future
+            )
+    ) -> None:
+        self._refresh = refresh
+        self._in_transition = in_transition
+        self._create_task = create_task
+        self._task: asyncio.Task | None = None
+        self._reset: bool = False
+        self.cycles: int = 0
+
+    @property
+    def active(self) -> bool:
+        """Идёт ли ускоренный опрос."""
+        return self._task is not None and not self._task.done()
+
+    def start(self, reset: bool = False) -> None:
+        """
+        Запускает ускоренный опрос, если он ещё не идёт.
+        reset - после команды управления: если опрос уже идёт, интервал
+        сбрасывается и выполняется как минимум ещё одно обновление.
+        """
+        if self.active:
+            self._reset = self._reset or reset
+            return
+        self._reset = False
+        self._task = self._create_task(self._run())
+
+    async def _run(self) -> None:
+        """
+        Опрашивает данные, пока состояние охранных зон не установится.
+        Первое обновление выполняется всегда, так как сразу после команды
+        API может ещё не вернуть переходное состояние.
+        """
+        self.cycles += 1
+        loop = asyncio.get_running_loop()
+        delay = TIME_OUT_REQUEST
+        deadline = loop.time() + COUNTER_REPEAT * TIME_OUT_REPEAT
+        while True:
+            await asyncio.sleep(delay)
+            reset, self._reset = self._reset, False
+            await self._refresh()
+            if reset:
+                delay = TIME_OUT_REQUEST
+                deadline = loop.time() + COUNTER_REPEAT * TIME_OUT_REPEAT
+                continue
+            if not self._in_transition():
+                _LOGGER.debug('Состояние охранных зон установилось')
+                return
+            if loop.time() >= deadline:
+                _LOGGER.warning('Состояние охранных зон не установилось '
+                                'за отведённое время')
+                return
+            delay = min(delay * 2, TIME_OUT_REPEAT)
+            _LOGGER.debug(f'Обновляю статус охраны через {delay} с.')
+
+    def cancel(self) -> None:
+        """Останавливает ускоренный опрос."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -1,9 +1,12 @@
-import json
+import asyncio
 import logging
+import time
+from typing import Any
 from collections import namedtuple
+from collections.abc import Callable
 from http import HTTPStatus
 
-from aiohttp import ClientResponse
+from aiohttp import ClientResponse, ClientSession
 
 from homeassistant.components.alarm_control_panel.const import (
     AlarmControlPanelState
@@ -11,9 +14,24 @@ from homeassistant.components.alarm_control_panel.const import (
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .commands import CommandQueue, queued_command
 from .enums import GuardState
 from .enums import TypeOfSensor, StateOfSensor, TypeOfCircuit
-from .exceptions import StateGuardError
+from .decode import AccountDecoder, DecodedAccount
+from .delta import ChangeSet, diff_account
+from .exceptions import (
+    StateGuardError, ResponseZontError, ThrottledZontError
+)
+from .index import AccountIndex
+from .ratelimit import (
+    TokenBucket, get_retry_after, PRIORITY_COMMAND, PRIORITY_POLL,
+    PRIORITY_BACKGROUND
+)
+from .profiler import UpdateProfiler
+from .singleflight import SingleFlight
+from .stats import LatencyWindow
+from .timings import PhaseTimer
+from .optimistic import PendingCommands, PendingValue
 from .models_zont_v1 import AccountZontOld, DeviceZontOld
 from .models_zont_v3 import (
     AccountZont, ErrorZont, SensorZONT, DeviceZONT, CircuitZONT,
@@ -26,7 +44,9 @@ from ..const import (
     MIN_TEMP_AIR, MAX_TEMP_AIR, MIN_TEMP_GVS, MAX_TEMP_GVS, MIN_TEMP_FLOOR,
     MAX_TEMP_FLOOR, MATCHES_GVS, MATCHES_FLOOR,
     BINARY_SENSOR_TYPES, URL_GET_DEVICES_OLD, NO_ERROR,
-    ZONT_API_URL,
+    ZONT_API_URL, ZONT_API_URL_ROOT, TIME_OUT_UPDATE_DATA, TIME_UPDATE_OLD,
+    RETRY_ATTEMPTS, TIME_RETRY_BACKOFF, TIME_RETRY_MAX, HEDGE_MIN_SAMPLES,
+    HEDGE_MAX_RATIO, TIME_HEDGE_MIN, SIZE_DECODE_EXECUTOR,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,12 +69,19 @@ class Zont:
     data: AccountZont = None
     data_old: AccountZontOld = AccountZontOld()
     error: ErrorZont = None
+    changes: ChangeSet | None = None
+    index: AccountIndex = AccountIndex()
 
     def __init__(self,
                  hass: HomeAssistant,
                  mail: str,
                  token: str,
-                 selected_devices: list[str] | None = None):
+                 selected_devices: list[str] | None = None,
+                 session: ClientSession | None = None,
+                 api_url_root: str = ZONT_API_URL_ROOT,
+                 limiter: TokenBucket | None = None,
+                 hedge: bool = False,
+                 executor_threshold: int = SIZE_DECODE_EXECUTOR * 1024):
         self.headers = {
             'X-ZONT-Token': token,
             'X-ZONT-Client': mail,
@@ -64,62 +91,418 @@ class Zont:
             selected_devices = []
         self.selected_devices = selected_devices
         self.mail = mail
-        self.session = async_get_clientsession(hass)
+        self.decoder = AccountDecoder()
+        self._synthetic: dict[int, dict[tuple, SensorZONT]] = {}
+        self._synthetic_changes = ChangeSet()
+        self.pending = PendingCommands()
+        self.commands = CommandQueue()
+        self.flight = SingleFlight(self._fetch_update, TIME_OUT_UPDATE_DATA)
+        self.revision: int = 0
+        self.timings = PhaseTimer()
+        self.raw_v3: bytes | None = None
+        self.payload_bytes: int | None = None
+        self.raw_v1: str | None = None
+        self.old_fetched_at: float | None = None
+        self._devices_old: dict[int, DeviceZontOld] = {}
+        self.updated_at: float | None = None
+        self.api_url_root = api_url_root
+        self.session = session or async_get_clientsession(hass)
+        self.limiter = limiter or TokenBucket()
+        self.executor_threshold = executor_threshold
+        self.offloaded: int = 0
+        self._decoding: asyncio.Future | None = None
+        self.hedge = hedge
+        self.latency = LatencyWindow()
+        self.hedges: int = 0
+        self.hedge_wins: int = 0
+        self.retried: int = 0
+        self.throttled: int = 0
+        self.profiler: UpdateProfiler | None = None
         _LOGGER.debug(f'Создан объект Zont')
 
-    async def init_old_data(self):
-        """Инициализирует данные из API V1"""
+    def _url(self, url: str) -> str:
+        """Адрес API относительно api_url_root (например, локальный mock)."""
+        return self.api_url_root + url.removeprefix(ZONT_API_URL_ROOT)
+
+    async def _request(
+            self, method: str, priority: int,
+            retry_server_errors: bool = True,
+            sent: list[float] | None = None,
+            deadline: float | None = None,
+            sending: asyncio.Event | None = None, **kwargs
+    ) -> ClientResponse:
+        """
+        Запрос к API через ограничитель частоты аккаунта.
+        Ответы 429 (и 5xx, если запрос можно повторить) повторяются
+        с задержкой из Retry-After или с экспоненциальной задержкой.
+        Повтор, который не успеет до deadline (time.monotonic), не
+        выполняется: возвращается полученный ответ.
+        В sent добавляется время отправки каждой попытки (perf_counter)
+        после ожидания ограничителя. Событие sending установлено, пока
+        попытка отправлена, и сброшено на время паузы перед повтором.
+        """
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            await self.limiter.acquire(priority)
+            if sent is not None:
+                sent.append(time.perf_counter())
+            if sending is not None:
+                sending.set()
+            response = await self.session.request(method, **kwargs)
+            status = response.status
+            throttled = status == HTTPStatus.TOO_MANY_REQUESTS
+            server_error = status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            retry = throttled or (server_error and retry_server_errors)
+            if not retry or attempt == RETRY_ATTEMPTS:
+                return response
+            delay = get_retry_after(response)
+            if delay is None:
+                delay = TIME_RETRY_BACKOFF * 2 ** attempt
+            delay = min(delay, TIME_RETRY_MAX)
+            if throttled:
+                # Лимит общий для аккаунта: ждут все запросы.
+                self.throttled += 1
+                self.limiter.pause(delay)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                _LOGGER.warning(f'API zont ответил {status}, повтор через '
+                                f'{delay:.1f} с. не успеет до таймаута')
+                return response
+            self.retried += 1
+            _LOGGER.warning(f'API zont ответил {status}, повтор запроса '
+                            f'через {delay:.1f} с.')
+            response.release()
+            if sending is not None:
+                sending.clear()
+            await asyncio.sleep(delay)
+
+    @property
+    def old_data_expired(self) -> bool:
+        """Истёк ли срок жизни данных API V1."""
+        return (self.old_fetched_at is None
+                or time.monotonic() - self.old_fetched_at >= TIME_UPDATE_OLD)
+
+    async def init_old_data(self) -> ChangeSet:
+        """
+        Запрашивает данные из API V1.
+        Ответ разбирается, только если он изменился. Возвращает
+        устройства, данные V1 которых изменились.
+        """
+        self.old_fetched_at = time.monotonic()
         headers = self.headers
-        response = await self.session.post(
-            url=URL_GET_DEVICES_OLD,
-            headers=headers
-        )
-        text = await response.text()
+        with self.timings.measure('fetch_v1'):
+            response = await self._request(
+                'POST', PRIORITY_BACKGROUND,
+                url=self._url(URL_GET_DEVICES_OLD),
+                headers=headers
+            )
+            text = await response.text()
         status_code = response.status
         if status_code != HTTPStatus.OK:
             _LOGGER.error(f'Не удалось получить данные из API V1. '
                           f'Status code: {status_code}. Text: {text}')
-            return
-        self.data_old = AccountZontOld.model_validate_json(text)
+            return ChangeSet()
+        if text == self.raw_v1:
+            _LOGGER.debug(f'Данные API V1 {self.mail} не изменились')
+            return ChangeSet()
+        with self.timings.measure('validate_v1'):
+            data_old = AccountZontOld.model_validate_json(text)
         _LOGGER.debug(f'For {self.mail} initialized old_data from API V1.')
+        return self._set_data_old(data_old, text)
+
+    def _set_data_old(
+            self, data_old: AccountZontOld, text: str | None
+    ) -> ChangeSet:
+        """Заменяет данные API V1 и их индекс по id устройства."""
+        changes = ChangeSet()
+        devices_old: dict[int, DeviceZontOld] = {}
+        for device in data_old.devices:
+            devices_old.setdefault(device.id, device)
+        for device_id in devices_old.keys() | self._devices_old.keys():
+            if devices_old.get(device_id) != self._devices_old.get(device_id):
+                changes.add_device(device_id)
+        self.data_old = data_old
+        self._devices_old = devices_old
+        self.raw_v1 = text
+        return changes
 
     async def get_update(self):
-        """Получаем обновление данных Zont"""
-        headers = self.headers
-        response = await self.session.get(
-            url=URL_GET_DEVICES,
-            headers=headers
-        )
-        text = await response.text()
-        status_code = response.status
+        """
+        Получаем обновление данных Zont.
+        Одновременные вызовы разделяют один HTTP-запрос. Номер revision
+        растёт с каждым выполненным запросом.
+        """
+        await self.flight.run()
+
+    def mark_stale(self) -> None:
+        """Данные на сервере изменились после команды или события."""
+        self.flight.mark_stale()
+
+    async def _fetch_update(self):
+        """Запрос данных аккаунта из API V3."""
+        deadline = time.monotonic() + self.flight.timeout
+        with self.timings.measure('fetch'):
+            status_code, body = await self._fetch_devices(deadline)
+        self.revision += 1
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.changes = ChangeSet()
+            raise ThrottledZontError(
+                f'API zont ограничил частоту запросов: {status_code}'
+            )
         if status_code != HTTPStatus.OK:
-            self.error = ErrorZont.model_validate_json(text)
-            _LOGGER.error(self.error.error_ui)
-            return
-
-        data_json = json.loads(text)
-        devices = data_json.get('devices')
-        if not self.selected_devices:
-            for device in devices:
-                self.selected_devices.append(str(device.get('id')))
-        actual_devices = list(filter(self._is_selected, devices))
-        data_json.update({'devices': actual_devices})
-        self.data = AccountZont.model_validate(data_json)
-        self._create_sensors()
-        _LOGGER.debug(f'Данные аккаунта {self.mail} обновлены. API V3')
+            self.error = ErrorZont.model_validate_json(body)
+            self.changes = ChangeSet()
+            raise ResponseZontError(
+                f'Ошибка запроса к API zont: {status_code}. '
+                f'{self.error.error_ui}'
+            )
+        data = await self._async_decode(body)
+        with self.timings.measure('apply'):
+            self._update_data(data)
+        self.payload_bytes = len(body)
+        self.raw_v3 = body
+        self.updated_at = time.time()
         return status_code
 
-    def _is_selected(self, device: dict) -> bool:
-        return str(device.get('id')) in self.selected_devices
+    async def _get_devices(
+            self, deadline: float, sending: asyncio.Event | None = None
+    ) -> tuple[int, bytes]:
+        """
+        Один запрос /widget/v3/devices. В окно задержки идёт сетевое
+        время последней попытки: без ожидания ограничителя частоты
+        и пауз перед повторами.
+        """
+        sent: list[float] = []
+        response = await self._request(
+            'GET', PRIORITY_POLL, sent=sent, deadline=deadline,
+            sending=sending,
+            url=self._url(URL_GET_DEVICES),
+            headers=self.headers
+        )
+        body = await response.read()
+        self.latency.record(time.perf_counter() - sent[-1])
+        return response.status, body
 
-    def _create_sensors(self):
-        """Создает дополнительные сенсоры"""
-        for device in self.data.devices:
-            self._create_radio_sensors(device)
-            self._create_sensors_of_boiler(device)
+    def _hedge_delay(self) -> float | None:
+        """
+        Через сколько отправлять повторный запрос: p95 задержки API.
+        None - без повтора (выключено, мало данных или исчерпана доля).
+        """
+        if (not self.hedge or len(self.latency) < HEDGE_MIN_SAMPLES
+                or self.hedges >= self.latency.count * HEDGE_MAX_RATIO):
+            return None
+        return max(self.latency.percentile(95), TIME_HEDGE_MIN)
 
-    @staticmethod
-    def _create_radio_sensors(device: DeviceZONT):
+    async def _fetch_devices(self, deadline: float) -> tuple[int, bytes]:
+        """
+        Запрос данных V3 с повтором на хвосте задержек: если ответа нет
+        дольше p95, отправляется второй такой же запрос, используется
+        первый полученный ответ, другой отменяется.
+        Задержка отсчитывается от отправки первого запроса. Пока он ждёт
+        повтора после 429/5xx или ограничитель на паузе, второй запрос
+        не отправляется.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._get_devices(deadline)
+        sending = asyncio.Event()
+        first = asyncio.ensure_future(self._get_devices(deadline, sending))
+        sent = asyncio.ensure_future(sending.wait())
+        tasks = {first}
+        try:
+            await asyncio.wait(
+                {first, sent}, return_when=asyncio.FIRST_COMPLETED
+            )
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            if not sending.is_set() or self.limiter.paused_for:
+                return await first
+            self.hedges += 1
+            _LOGGER.debug(f'Нет ответа API за {delay:.2f} с., '
+                          f'отправлен повторный запрос')
+            tasks.add(asyncio.ensure_future(self._get_devices(deadline)))
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                if not tasks:
+                    return done.pop().result()
+        finally:
+            sent.cancel()
+            for task in tasks:
+                task.cancel()
+
+    def latency_as_dict(self) -> dict[str, Any]:
+        """Перцентили задержки опроса API V3 и счётчики повторов."""
+        return {
+            **self.latency.as_dict(),
+            'hedge': self.hedge,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+        }
+
+    def sizes_as_dict(self) -> dict[str, int | None]:
+        """Размеры данных: объекты индекса, кэши и исходные ответы."""
+        index = self.index
+        return {
+            'devices': len(index.devices),
+            'sensors': len(index.sensors),
+            'circuits': len(index.circuits),
+            'guard_zones': len(index.guard_zones),
+            'modes': len(index.modes_by_id),
+            'statuses': len(index.statuses),
+            'toggle_buttons': len(index.toggle_buttons),
+            'buttons': len(index.buttons),
+            'index': len(index),
+            'synthetic_sensors': sum(
+                len(sensors) for sensors in self._synthetic.values()
+            ),
+            'decoder_cache': len(self.decoder),
+            'pending': len(self.pending),
+            'devices_old': len(self._devices_old),
+            'raw_v3_bytes': len(self.raw_v3) if self.raw_v3 else None,
+            'raw_v1_chars': len(self.raw_v1) if self.raw_v1 else None,
+        }
+
+    def load_snapshot(self, snapshot: dict | None) -> bool:
+        """
+        Загружает сохранённые ответы API для тёплого старта.
+        Возвращает False, если снимка нет или он не разбирается.
+        """
+        if not snapshot or not snapshot.get('v3'):
+            return False
+        try:
+            if snapshot.get('v1'):
+                self._set_data_old(
+                    AccountZontOld.model_validate_json(snapshot['v1']),
+                    snapshot['v1']
+                )
+            raw_v3 = snapshot['v3'].encode()
+            self._update_data(self._decode(raw_v3, self._selected()))
+        except ValueError as err:
+            _LOGGER.warning(f'Сохранённые данные {self.mail} '
+                            f'не разобраны: {err}')
+            self.data = None
+            self._set_data_old(AccountZontOld(), None)
+            self.index = AccountIndex()
+            self.decoder.invalidate()
+            return False
+        self.raw_v3 = raw_v3
+        self.updated_at = snapshot.get('updated_at')
+        _LOGGER.debug(f'Данные {self.mail} загружены из снимка '
+                      f'от {self.updated_at}')
+        return True
+
+    def _selected(self) -> set[str] | None:
+        return set(self.selected_devices) or None
+
+    async def _async_decode(self, body: bytes) -> AccountZont:
+        """
+        Разбор ответа V3. Большие ответы разбираются в потоке
+        исполнителя, чтобы не блокировать event loop. Кэш декодера
+        и производные сенсоры обновляются в event loop.
+        """
+        if len(body) < self.executor_threshold:
+            return self._decode(body, self._selected())
+        if self._decoding is not None and not self._decoding.done():
+            # Разбор прерванного по таймауту опроса ещё идёт в потоке.
+            await asyncio.wait({self._decoding})
+        self.offloaded += 1
+        self._decoding = asyncio.get_running_loop().run_in_executor(
+            None, self._parse, body, self._selected()
+        )
+        return self._commit(await self._decoding)
+
+    def _decode(
+            self, body: bytes, selected: set[str] | None
+    ) -> AccountZont:
+        """Разбор ответа V3 в event loop."""
+        return self._commit(self._parse(body, selected))
+
+    def _parse(
+            self, body: bytes, selected: set[str] | None
+    ) -> DecodedAccount:
+        """
+        Валидация ответа V3 без изменения состояния.
+        Не обращается к Home Assistant и может выполняться вне event loop.
+        """
+        with self.timings.measure('decode'):
+            return self.decoder.parse(body, selected)
+
+    def _commit(self, result: DecodedAccount) -> AccountZont:
+        """Кэш декодера и производные сенсоры новых устройств."""
+        data, fresh_devices = self.decoder.commit(result)
+        with self.timings.measure('create_sensors'):
+            self._synthetic_changes = ChangeSet()
+            self._create_sensors(fresh_devices)
+        return data
+
+    def _update_data(self, data: AccountZont) -> None:
+        """Обновляет снимок аккаунта разобранным ответом API V3."""
+        previous = self.data
+        self.data = data
+        if not self.selected_devices:
+            for device in self.data.devices:
+                self.selected_devices.append(str(device.id))
+        self.index = AccountIndex(self.data)
+        for device_id in self._synthetic.keys() - self.index.devices.keys():
+            del self._synthetic[device_id]
+        self.pending.apply(self.index)
+        for device_id in self.pending.devices:
+            # Объект с наложенным значением нельзя переиспользовать.
+            self.invalidate_device(device_id)
+        self.changes = diff_account(previous, self.data)
+        if self.changes is not None:
+            # Производные сенсоры обновляются на месте и не видны в сравнении.
+            self.changes.update(self._synthetic_changes)
+        _LOGGER.debug(f'Данные аккаунта {self.mail} обновлены. API V3. '
+                      f'Изменения: {self.changes}')
+
+    def invalidate_device(self, device_id: int) -> None:
+        """
+        Сбрасывает кэш устройства после команды управления,
+        чтобы следующий опрос заново провалидировал его данные.
+        """
+        self.decoder.invalidate(device_id)
+
+    def add_pending(self, value: PendingValue) -> ChangeSet:
+        """Показывает значение команды до её подтверждения API."""
+        self.invalidate_device(value.device_id)
+        return self.pending.add(value, self.index)
+
+    def _create_sensors(self, devices: list[DeviceZONT]):
+        """Создает дополнительные сенсоры для заново полученных устройств"""
+        for device in devices:
+            cache = self._synthetic.get(device.id, {})
+            self._synthetic[device.id] = {}
+            self._create_radio_sensors(device, cache)
+            self._create_sensors_of_boiler(device, cache)
+
+    def _add_synthetic_sensor(
+            self, device: DeviceZONT, cache: dict, key: tuple,
+            factory: Callable[[], SensorZONT], **values
+    ):
+        """
+        Добавляет в устройство производный сенсор.
+        Сенсор создаётся один раз, при следующих опросах у него
+        обновляются только значения.
+        """
+        sensor = cache.get(key)
+        if sensor is None:
+            sensor = factory()
+        else:
+            for field, value in values.items():
+                if getattr(sensor, field) != value:
+                    setattr(sensor, field, value)
+                    self._synthetic_changes.add_object(device.id, sensor.id)
+        self._synthetic[device.id][key] = sensor
+        device.sensors.append(sensor)
+
+    def _create_radio_sensors(self, device: DeviceZONT, cache: dict):
         """
         Создает дополнительные сенсоры
         уровня батареи и связи для радио датчиков
@@ -127,80 +510,113 @@ class Zont:
         for i in range(len(device.sensors)):
             sensor = device.sensors[i]
             if sensor.battery:
-                device.sensors.append(SensorZONT(
-                    id=f'{sensor.id}_rssi',
-                    name=f'{sensor.name}_rssi',
-                    type=TypeOfSensor.SIGNAL_STRENGTH,
-                    status=StateOfSensor.OK,
-                    value=sensor.rssi,
-                    unit='дБм'
-                ))
-                device.sensors.append(SensorZONT(
-                    id=f'{sensor.id}_battery',
-                    name=f'{sensor.name}_battery',
-                    type=TypeOfSensor.BATTERY,
-                    status=StateOfSensor.OK,
-                    value=sensor.battery,
-                    unit='%'
-                ))
+                self._add_synthetic_sensor(
+                    device, cache,
+                    (sensor.id, TypeOfSensor.SIGNAL_STRENGTH),
+                    lambda: SensorZONT(
+                        id=f'{sensor.id}_rssi',
+                        name=f'{sensor.name}_rssi',
+                        type=TypeOfSensor.SIGNAL_STRENGTH,
+                        status=StateOfSensor.OK,
+                        value=sensor.rssi,
+                        unit='дБм'
+                    ),
+                    value=sensor.rssi
+                )
+                self._add_synthetic_sensor(
+                    device, cache,
+                    (sensor.id, TypeOfSensor.BATTERY),
+                    lambda: SensorZONT(
+                        id=f'{sensor.id}_battery',
+                        name=f'{sensor.name}_battery',
+                        type=TypeOfSensor.BATTERY,
+                        status=StateOfSensor.OK,
+                        value=sensor.battery,
+                        unit='%'
+                    ),
+                    value=sensor.battery
+                )
 
-    @staticmethod
-    def _create_boiler_error_sensor(boiler: CircuitZONT, device: DeviceZONT):
+    def _create_boiler_error_sensor(
+            self, boiler: CircuitZONT, device: DeviceZONT, cache: dict):
         """Создает сенсор ошибок котла."""
         text = NO_ERROR
         if boiler.error is not None:
             text = f'{boiler.error.oem} | {boiler.error.text}'
-        device.sensors.append(SensorZONT(
-            id=f'{boiler.id}_boiler_error',
-            name=f'{boiler.name}_ошибка',
-            type=TypeOfSensor.BOILER_FAILURE_TEXT,
-            status=StateOfSensor.OK,
-            value=text,
-            unit='txt'
-        ))
+        self._add_synthetic_sensor(
+            device, cache,
+            (boiler.id, TypeOfSensor.BOILER_FAILURE_TEXT),
+            lambda: SensorZONT(
+                id=f'{boiler.id}_boiler_error',
+                name=f'{boiler.name}_ошибка',
+                type=TypeOfSensor.BOILER_FAILURE_TEXT,
+                status=StateOfSensor.OK,
+                value=text,
+                unit='txt'
+            ),
+            value=text
+        )
 
-    @staticmethod
-    def _create_boiler_active_sensor(boiler: CircuitZONT, device: DeviceZONT):
+    def _create_boiler_active_sensor(
+            self, boiler: CircuitZONT, device: DeviceZONT, cache: dict):
         """Создает сенсор работы котла."""
-        device.sensors.append(SensorZONT(
-            id=f'{boiler.id}_boiler',
-            name=f'{boiler.name}_состояние',
-            type=TypeOfSensor.ROOM_THERMOSTAT,
-            status=StateOfSensor.OK,
-            triggered=boiler.active,
-        ))
-
-    def _create_sensors_of_boiler(self, device: DeviceZONT):
+        self._add_synthetic_sensor(
+            device, cache,
+            (boiler.id, TypeOfSensor.ROOM_THERMOSTAT),
+            lambda: SensorZONT(
+                id=f'{boiler.id}_boiler',
+                name=f'{boiler.name}_состояние',
+                type=TypeOfSensor.ROOM_THERMOSTAT,
+                status=StateOfSensor.OK,
+                triggered=boiler.active,
+            ),
+            triggered=boiler.active
+        )
+
+    def _create_sensors_of_boiler(self, device: DeviceZONT, cache: dict):
         """Создаёт дополнительные сенсоры котла"""
         for circuit in device.circuits:
             if circuit.type == TypeOfCircuit.BOILER:
-                self._create_boiler_error_sensor(circuit, device)
-                self._create_boiler_active_sensor(circuit, device)
+                self._create_boiler_error_sensor(circuit, device, cache)
+                self._create_boiler_active_sensor(circuit, device, cache)
 
     def get_device(self, device_id: int) -> DeviceZONT | None:
         """Получить устройство по его id"""
-        return next(
-            (device for device in self.data.devices if device.id == device_id),
-            None
-        )
+        return self.index.devices.get(device_id)
 
     def get_device_old(self, device_id: int) -> DeviceZontOld | None:
         """Получить устройство по его id для старого API"""
-        return next(
-            (device for device in self.data_old.devices
-             if device.id == device_id),
-            None
-        )
+        return self._devices_old.get(device_id)
 
     def get_sensor(
             self, device_id: int, sensor_id: int | str
     ) -> SensorZONT | None:
         """Получить сенсор по его id и id устройства"""
-        device = self.get_device(device_id)
-        return next(
-            (sensor for sensor in device.sensors if sensor.id == sensor_id),
-            None
-        )
+        return self.index.sensors.get((device_id, sensor_id))
+
+    def find_circuit(
+            self, device_id: int, circuit_id: int
+    ) -> CircuitZONT | None:
+        """Найти контур отопления по индексу текущего снимка"""
+        return self.index.circuits.get((device_id, circuit_id))
+
+    def find_guard_zone(
+            self, device_id: int, guard_zone_id: int
+    ) -> GuardZoneZONT | None:
+        """Найти охранную зону по индексу текущего снимка"""
+        return self.index.guard_zones.get((device_id, guard_zone_id))
+
+    def find_heating_mode_by_id(
+            self, device_id: int, heating_mode_id: int
+    ) -> HeatingModeZONT | None:
+        """Найти отопительный режим по id в индексе текущего снимка"""
+        return self.index.modes_by_id.get((device_id, heating_mode_id))
+
+    def find_heating_mode_by_name(
+            self, device_id: int, heating_mode_name: str
+    ) -> HeatingModeZONT | None:
+        """Найти отопительный режим по name в индексе текущего снимка"""
+        return self.index.modes_by_name.get((device_id, heating_mode_name))
 
     @staticmethod
     def get_circuit(
@@ -229,6 +645,13 @@ class Zont:
             return True
         return False
 
+    def has_guard_transition(self) -> bool:
+        """Есть ли охранные зоны в переходном состоянии."""
+        return any(
+            self.need_repeat_update(guard_zone.state)
+            for guard_zone in self.index.guard_zones.values()
+        )
+
     @staticmethod
     def get_state_guard_zone_for_ha(
             guard_zone: GuardZoneZONT
@@ -315,17 +738,13 @@ class Zont:
 
     def get_status_control(
             self, device_id: int, status_id: int) -> StatusZONT:
-        device = self.get_device(device_id)
-        return next((status for status in device.controls.statuses if
-                     (status.id == status_id)), None)
+        return self.index.statuses.get((device_id, status_id))
 
     def get_toggle_button(
             self, device_id: int, toggle_button_id: int) -> ToggleButtonsZONT:
-        device = self.get_device(device_id)
-        return next(
-            (toggle_button for toggle_button in device.controls.toggle_buttons
-             if (toggle_button.id == toggle_button_id)), None)
+        return self.index.toggle_buttons.get((device_id, toggle_button_id))
 
+    @queued_command('target_temp', 'circuit')
     @check_send_command
     async def set_target_temperature(
             self, device: DeviceZONT, circuit: CircuitZONT,
@@ -333,33 +752,41 @@ class Zont:
     ) -> ClientResponse:
         """Отправка команды на установку нужной температуры в контуре."""
         _LOGGER.info(f'Отправлена уставка температуры на {target_temp}')
-        return await self.session.post(
-            url=f'{ZONT_API_URL}devices/{device.id}/circuits/'
+        self.invalidate_device(device.id)
+        return await self._request(
+            'POST', PRIORITY_COMMAND,
+            url=f'{self._url(ZONT_API_URL)}devices/{device.id}/circuits/'
                 f'{circuit.id}/actions/target-temp',
             json={'target_temp': target_temp},
             headers=self.headers
         )
 
+    @queued_command('heating_mode', 'circuit')
     @check_send_command
     async def set_heating_mode(
             self, device: DeviceZONT, circuit: CircuitZONT,
             heating_mode_id: int
     ) -> ClientResponse:
         """Отправка команды на установку нужного режима для контура."""
-        return await self.session.post(
-            url=f'{ZONT_API_URL}devices/{device.id}/modes/'
+        self.invalidate_device(device.id)
+        return await self._request(
+            'POST', PRIORITY_COMMAND,
+            url=f'{self._url(ZONT_API_URL)}devices/{device.id}/modes/'
                 f'{heating_mode_id}/actions/activate',
             json={'circuit_id': circuit.id},
             headers=self.headers
         )
 
+    @queued_command('heating_mode', 'circuit')
     async def set_heating_mode_v1(
             self, device: DeviceZONT, circuit: CircuitZONT,
             heating_mode_id: int
     ) -> ClientResponse:
         """Отправка команды на установку нужного режима для контура."""
-        response = await self.session.post(
-            url=URL_SEND_COMMAND_ZONT_OLD,
+        self.invalidate_device(device.id)
+        response = await self._request(
+            'POST', PRIORITY_COMMAND,
+            url=self._url(URL_SEND_COMMAND_ZONT_OLD),
             json={
                 'device_id': device.id,
                 'command_name': 'SelectHeatingModeForCircuit',
@@ -373,17 +800,21 @@ class Zont:
         _LOGGER.debug(await response.text())
         return response
 
+    @queued_command('heating_mode')
     @check_send_command
     async def set_heating_mode_all_circuits(
             self, device: DeviceZONT, heating_mode: HeatingModeZONT
     ) -> ClientResponse:
         """Отправка команды на установку нужного режима для всех контуров."""
-        return await self.session.post(
-            url=f'{ZONT_API_URL}devices/{device.id}/modes/'
+        self.invalidate_device(device.id)
+        return await self._request(
+            'POST', PRIORITY_COMMAND,
+            url=f'{self._url(ZONT_API_URL)}devices/{device.id}/modes/'
                 f'{heating_mode.id}/actions/activate',
             headers=self.headers
         )
 
+    @queued_command('control', 'button')
     @check_send_command
     async def switch_button(
             self, device: DeviceZONT,
@@ -391,21 +822,28 @@ class Zont:
             command: bool,
     ) -> ClientResponse:
         """Отправка команды на установку нужной температуры в контуре."""
-        return await self.session.post(
-            url=f'{ZONT_API_URL}devices/{device.id}/controls/'
+        self.invalidate_device(device.id)
+        return await self._request(
+            'POST', PRIORITY_COMMAND,
+            # Нажатие кнопки без состояния при ошибке сервера не повторяем.
+            retry_server_errors=not isinstance(button, ButtonZONT),
+            url=f'{self._url(ZONT_API_URL)}devices/{device.id}/controls/'
                 f'{button.id}/actions/trigger',
             json={'target_state': command},
             headers=self.headers
         )
 
+    @queued_command('guard', 'guard_zone')
     @check_send_command
     async def toggle_alarm(
             self, device: DeviceZONT, guard_zone: GuardZoneZONT,
             command: bool
     ) -> ClientResponse:
         """Отправка команды на изменение состояния охранной зоны."""
-        return await self.session.post(
-            url=f'{ZONT_API_URL}devices/{device.id}/guard-zones/'
+        self.invalidate_device(device.id)
+        return await self._request(
+            'POST', PRIORITY_COMMAND,
+            url=f'{self._url(ZONT_API_URL)}devices/{device.id}/guard-zones/'
                 f'{guard_zone.id}/actions/activate',
             json={
                 'zone_id': guard_zone.id,
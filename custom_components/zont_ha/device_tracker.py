@@ -5,11 +5,11 @@ from homeassistant.components.device_tracker import TrackerEntity, SourceType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator
 from .const import DOMAIN, ENTRIES, CURRENT_ENTITY_IDS
+from .entity import ZontCoordinatorEntity
 from .core.models_zont import DeviceZONT
-from .core.models_zont_v1 import DeviceZontOld
+from .core.models_zont_v1 import DeviceZontOld, StationaryLocationZontOld
 from .core.zont import Zont
 
 _LOGGER = logging.getLogger(__name__)
@@ -51,7 +51,7 @@ async def async_setup_entry(
         #     )
 
 
-class Position(CoordinatorEntity, TrackerEntity):
+class Position(ZontCoordinatorEntity, TrackerEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -91,6 +91,12 @@ class Position(CoordinatorEntity, TrackerEntity):
             return f"<Device tracker entity {self.name}>"
         return super().__repr__()
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Обработка обновлённых данных от координатора"""
+        if self.coordinator.is_changed(self._device.id):
+            self.async_write_ha_state()
+
 
 # class CarPosition(Position):
 #
@@ -123,18 +129,27 @@ class StationaryPosition(Position):
             unique_id: str
     ) -> None:
         super().__init__(coordinator, device, unique_id)
-        self._device_old: DeviceZontOld = self._zont.get_device_old(device.id)
         self._unique_id = unique_id
 
+    @property
+    def _location(self) -> StationaryLocationZontOld | None:
+        """Расположение из данных API V1, которые периодически обновляются."""
+        device_old = self._zont.get_device_old(self._device.id)
+        if device_old is None:
+            return None
+        return device_old.stationary_location
+
     @property
     def latitude(self) -> float | None:
         """Return latitude value of the device."""
-        return self._device_old.stationary_location.latitude
+        location = self._location
+        return location.latitude if location is not None else None
 
     @property
     def longitude(self) -> float | None:
         """Return longitude value of the device."""
-        return self._device_old.stationary_location.longitude
+        location = self._location
+        return location.longitude if location is not None else None
 
     @cached_property
     def unique_id(self) -> str:
@@ -0,0 +1,122 @@
+from typing import Any
+
+from pydantic_core import from_json
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from . import ZontCoordinator, get_api_device_id
+from .const import DOMAIN, ENTRIES
+
+TO_REDACT = {'mail', 'token', 'password', 'name'}
+# Данные ответов API, по которым можно определить владельца и объект.
+PAYLOAD_TO_REDACT = {
+    'name', 'serial', 'msisdn', 'balance', 'ussd', 'tariff',
+    'sim_paid_until', 'loc', 'latitude', 'longitude', 'gps',
+}
+
+
+def _raw_payloads(coordinator: ZontCoordinator) -> dict[str, Any]:
+    """Последние ответы API V3 и V1 без персональных данных."""
+    zont = coordinator.zont
+    payloads = {}
+    for key, raw in (('v3', zont.raw_v3), ('v1', zont.raw_v1)):
+        if raw is None:
+            payloads[key] = None
+            continue
+        try:
+            payloads[key] = async_redact_data(
+                from_json(raw), PAYLOAD_TO_REDACT
+            )
+        except ValueError as err:
+            payloads[key] = f'не разобран: {err}'
+    return payloads
+
+
+def _performance(coordinator: ZontCoordinator) -> dict[str, Any]:
+    """Счётчики и длительности опросов, запросов, webhook и команд."""
+    zont = coordinator.zont
+    return {
+        'startup': coordinator.startup.as_dict(),
+        'timings': zont.timings.as_dict(),
+        'polls': coordinator.stats.as_dict(),
+        'latency': zont.latency_as_dict(),
+        'requests': {
+            'retried': zont.retried,
+            'throttled': zont.throttled,
+            'limiter': zont.limiter.as_dict(),
+            'breaker': coordinator.breaker.as_dict(),
+            'flight': zont.flight.as_dict(),
+        },
+        'scheduler': coordinator.scheduler.as_dict(),
+        'stale': coordinator.stale,
+        'data_age': coordinator.data_age,
+        'webhook': coordinator.webhook.as_dict(),
+        'commands': zont.commands.as_dict(),
+        'decode': {
+            'executor_threshold': zont.executor_threshold,
+            'offloaded': zont.offloaded,
+            'validated': zont.decoder.validated,
+            'reused': zont.decoder.reused,
+        },
+        'sizes': zont.sizes_as_dict(),
+        'snapshot_saves': coordinator.snapshot.saves,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+        hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Диагностика записи интеграции."""
+    coordinator: ZontCoordinator = (
+        hass.data[DOMAIN][ENTRIES][config_entry.entry_id]
+    )
+    return {
+        'entry': async_redact_data(dict(config_entry.data), TO_REDACT),
+        **_performance(coordinator),
+        'payloads': _raw_payloads(coordinator),
+    }
+
+
+async def async_get_device_diagnostics(
+        hass: HomeAssistant, config_entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Диагностика контроллера или служебного устройства ZONT API."""
+    coordinator: ZontCoordinator = (
+        hass.data[DOMAIN][ENTRIES][config_entry.entry_id]
+    )
+    zont = coordinator.zont
+    identifier = next(
+        (value for domain, value in device.identifiers if domain == DOMAIN),
+        None
+    )
+    if identifier == get_api_device_id(config_entry.entry_id):
+        return _performance(coordinator)
+    try:
+        device_id = int(identifier)
+    except (TypeError, ValueError):
+        return {'error': f'Неизвестное устройство: {identifier}'}
+    device_zont = zont.get_device(device_id)
+    device_old = zont.get_device_old(device_id)
+    result = {
+        'device': None,
+        'device_v1': async_redact_data(
+            device_old.model_dump(mode='json'), PAYLOAD_TO_REDACT
+        ) if device_old is not None else None,
+        'pending': [
+            repr(pending) for pending in zont.pending.for_device(device_id)
+        ],
+    }
+    if device_zont is not None:
+        result['device'] = async_redact_data(
+            device_zont.model_dump(mode='json'), PAYLOAD_TO_REDACT
+        )
+        result['sizes'] = {
+            'sensors': len(device_zont.sensors),
+            'circuits': len(device_zont.circuits),
+            'guard_zones': len(device_zont.guard_zones),
+            'modes': len(device_zont.modes),
+        }
+    return result
@@ -0,0 +1,17 @@
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import ZontCoordinator
+
+
+class ZontCoordinatorEntity(CoordinatorEntity[ZontCoordinator]):
+    """
+    Сущность с данными ZontCoordinator.
+    Атрибут stale показывает, получены ли значения последним запросом
+    к API или взяты из ранее полученных данных.
+    """
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self.coordinator.data_attributes()
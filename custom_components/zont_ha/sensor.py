@@ -1,18 +1,23 @@
 import logging
 from functools import cached_property
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass, SensorEntity, SensorEntityDescription,
+    SensorStateClass
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 from . import ZontCoordinator
 from .const import (
-    DOMAIN, SENSOR_TYPE_ICON, UNIT_BY_TYPE,
-    CURRENT_ENTITY_IDS, ENTRIES
+    DOMAIN, SENSOR_TYPE_ICON,
+    CURRENT_ENTITY_IDS, ENTRIES, ATTR_DATA_AGE, ATTR_STALE
 )
+from .entity import ZontCoordinatorEntity
+from .units import UNIT_BY_TYPE
 from .core.models_zont_v3 import SensorZONT, DeviceZONT
 from .core.utils import (
     get_devise_class_sensor, get_unit_sensor, validate_value_sensor,
@@ -21,6 +26,53 @@ from .core.utils import (
 
 _LOGGER = logging.getLogger(__name__)
 
+API_SENSORS = (
+    SensorEntityDescription(
+        key='duration',
+        name='Длительность обновления',
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key='latency',
+        name='Задержка API',
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key='payload',
+        name='Размер ответа API',
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key='notified',
+        name='Обновлено сущностей',
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key='failures',
+        name='Неудачные обновления',
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key='updated_at',
+        name='Данные получены',
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+)
+# Метрики в секундах, для сенсоров - миллисекунды.
+API_SENSORS_SCALE = {'duration': 1000, 'latency': 1000}
+POLL_PHASES = ('fetch', 'decode', 'create_sensors', 'apply', 'dispatch')
+
 
 async def async_setup_entry(
         hass: HomeAssistant,
@@ -32,6 +84,15 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][ENTRIES][entry_id]
     zont = coordinator.zont
 
+    api_sensors = [
+        ZontApiSensor(coordinator, description, entry_id)
+        for description in API_SENSORS
+    ]
+    for sensor in api_sensors:
+        hass.data[DOMAIN][CURRENT_ENTITY_IDS][entry_id].append(
+            sensor.unique_id)
+    async_add_entities(api_sensors)
+
     if not zont.data.devices:
         return
     for device in zont.data.devices:
@@ -48,7 +109,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены сенсоры: {sens}')
 
 
-class ZontSensor(CoordinatorEntity, SensorEntity):
+class ZontSensor(ZontCoordinatorEntity, SensorEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -57,6 +118,9 @@ class ZontSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._device = device
         self._sensor = sensor
+        # Последнее принятое значение. Объект сенсора может быть общим
+        # с данными координатора, поэтому значение хранится отдельно.
+        self._value = sensor.value
         self._unique_id = unique_id
         self._attr_device_info = coordinator.devices_info(device.id)
         self._attr_icon = SENSOR_TYPE_ICON.get(sensor.type.value)
@@ -75,12 +139,12 @@ class ZontSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> float | str:
         """Возвращает состояние сенсора"""
-        if self._sensor.type == 'battery' and isinstance(self._sensor.value, float):
-            return int(self._sensor.value)
-        elif isinstance(self._sensor.value, float):
-            return round(self._sensor.value, 2)
+        if self._sensor.type == 'battery' and isinstance(self._value, float):
+            return int(self._value)
+        elif isinstance(self._value, float):
+            return round(self._value, 2)
         else:
-            return self._sensor.value
+            return self._value
 
     @cached_property
     def native_unit_of_measurement(self) -> str | None:
@@ -103,7 +167,8 @@ class ZontSensor(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
-
+        if not self.coordinator.is_changed(self._device.id, self._sensor.id):
+            return
         sensor = self.coordinator.zont.get_sensor(
             self._device.id,
             self._sensor.id
@@ -111,10 +176,84 @@ class ZontSensor(CoordinatorEntity, SensorEntity):
         if sensor is None:
             _LOGGER.error(f'Сенсор по id={self._sensor.id} не найден')
             return
-        if sensor.value != self._sensor.value:
+        if sensor.value != self._value:
             _LOGGER.debug(
                 f'Сенсор "{self._device.name}_{self._sensor.name}" обновился '
-                f'с {self._sensor.value} на {sensor.value}')
-        self._sensor.value = validate_value_sensor(
-            sensor.value, self._sensor.value)
+                f'с {self._value} на {sensor.value}')
+        self._value = validate_value_sensor(sensor.value, self._value)
         self.async_write_ha_state()
+
+
+class ZontApiSensor(ZontCoordinatorEntity, SensorEntity):
+    """
+    Диагностический сенсор обновлений API записи на устройстве
+    "ZONT API". Значение - последнее, в атрибутах p50/p95/p99.
+    Сенсор updated_at - время последнего успешного запроса к API,
+    в атрибутах возраст данных и признак stale.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+            self, coordinator: ZontCoordinator,
+            description: SensorEntityDescription, entry_id: str
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f'{entry_id}_api_{description.key}'
+        self._attr_name = f'ZONT API {description.name}'
+        self._attr_device_info = coordinator.api_device_info()
+        self._scale = API_SENSORS_SCALE.get(description.key, 1)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.stats.add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Статистика доступна и при недоступном API."""
+        return True
+
+    def _scaled(self, value: float | None) -> float | None:
+        if value is None:
+            return None
+        return round(value * self._scale, 3)
+
+    @property
+    def native_value(self) -> float | int | None:
+        stats = self.coordinator.stats
+        key = self.entity_description.key
+        if key == 'failures':
+            return stats.failures
+        if key == 'updated_at':
+            return self.coordinator.data_updated_at
+        return self._scaled(stats.last.get(key))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        key = self.entity_description.key
+        if key == 'failures':
+            return {}
+        if key == 'updated_at':
+            age = self.coordinator.data_age
+            return {
+                ATTR_STALE: self.coordinator.stale,
+                ATTR_DATA_AGE: round(age) if age is not None else None,
+            }
+        attributes = {
+            name: self._scaled(value)
+            for name, value in self.coordinator.stats.percentiles(key).items()
+        }
+        if key == 'duration':
+            # Разбивка последнего опроса по этапам, мс.
+            last = self.coordinator.zont.timings.last
+            for phase in POLL_PHASES:
+                if phase in last:
+                    attributes[f'{phase}_ms'] = round(last[phase] * 1000, 3)
+        return attributes
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Состояние записывается слушателем статистики после раздачи."""
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN, ENTRIES, SERVICE_PROFILE_UPDATES, PROFILE_UPDATES,
+    LIMIT_PROFILE_UPDATES, PROFILE_TOP, LIMIT_PROFILE_TOP, TIME_OUT_PROFILE,
+    LIMIT_PROFILE_TIMEOUT
+)
+from .core.profiler import UpdateProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SORTS = ('cumulative', 'tottime', 'calls')
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional('updates', default=PROFILE_UPDATES): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=LIMIT_PROFILE_UPDATES)
+    ),
+    vol.Optional('top', default=PROFILE_TOP): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=LIMIT_PROFILE_TOP)
+    ),
+    vol.Optional('sort', default=PROFILE_SORTS[0]): vol.In(PROFILE_SORTS),
+    vol.Optional('timeout', default=TIME_OUT_PROFILE): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=LIMIT_PROFILE_TIMEOUT)
+    ),
+    vol.Optional('refresh', default=False): cv.boolean,
+})
+
+
+def _write_profile(
+        profiler: UpdateProfiler, path: str, top: int, sort: str
+) -> dict:
+    """Запись файла статистики и сводка (в потоке исполнителя)."""
+    profiler.profile.dump_stats(path)
+    return profiler.summary(top, sort)
+
+
+async def async_profile_updates(call: ServiceCall) -> ServiceResponse:
+    """
+    Профилирует следующие updates обновлений всех записей, webhook
+    и команды. Файл статистики pstats (snakeviz, python -m pstats)
+    сохраняется в папку конфигурации, ответ - top функций профиля.
+    """
+    hass = call.hass
+    coordinators = list(hass.data.get(DOMAIN, {}).get(ENTRIES, {}).values())
+    if not coordinators:
+        raise HomeAssistantError('Нет загруженных записей ZONT')
+    if any(coordinator.zont.profiler for coordinator in coordinators):
+        raise HomeAssistantError('Профилирование уже выполняется')
+    updates = call.data['updates']
+    profiler = UpdateProfiler(updates)
+    for coordinator in coordinators:
+        coordinator.zont.profiler = profiler
+    _LOGGER.info(f'Профилирование {updates} обновлений ZONT')
+    try:
+        if call.data['refresh']:
+            for coordinator in coordinators:
+                await coordinator.async_request_refresh()
+        await asyncio.wait_for(
+            asyncio.shield(profiler.done), call.data['timeout']
+        )
+    except TimeoutError:
+        _LOGGER.info(f'Профилирование ZONT завершено по таймауту: '
+                     f'{profiler.counts}')
+    finally:
+        profiler.stop()
+        for coordinator in coordinators:
+            coordinator.zont.profiler = None
+    if profiler.error is not None:
+        raise HomeAssistantError(
+            f'Профилирование невозможно: {profiler.error}'
+        )
+    timestamp = dt_util.now().strftime('%Y%m%d_%H%M%S')
+    path = hass.config.path(f'{DOMAIN}_profile_{timestamp}.prof')
+    summary = await hass.async_add_executor_job(
+        _write_profile, profiler, path, call.data['top'], call.data['sort']
+    )
+    _LOGGER.info(f'Профиль обновлений ZONT записан в {path}')
+    return {
+        'file': path,
+        'completed': profiler.counts['update'] >= updates,
+        **summary,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Регистрирует сервисы интеграции."""
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_UPDATES, async_profile_updates,
+        schema=PROFILE_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
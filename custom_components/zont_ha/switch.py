@@ -4,10 +4,11 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import ZontCoordinator
 from .const import DOMAIN, ENTRIES, CURRENT_ENTITY_IDS
+from .entity import ZontCoordinatorEntity
 from .core.models_zont_v3 import DeviceZONT, ToggleButtonsZONT
+from .core.optimistic import PendingValue
 from .core.zont import Zont
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ async def async_setup_entry(
             _LOGGER.debug(f'Добавлены выключатели: {switches}')
 
 
-class ZontSwitch(CoordinatorEntity, SwitchEntity):
+class ZontSwitch(ZontCoordinatorEntity, SwitchEntity):
 
     def __init__(
             self, coordinator: ZontCoordinator, device: DeviceZONT,
@@ -70,25 +71,27 @@ class ZontSwitch(CoordinatorEntity, SwitchEntity):
         """Return True if entity is on."""
         return self._toggle_button.active
 
+    async def _async_switch(self, command: bool) -> None:
+        """Переключение с оптимистичным состоянием до подтверждения API."""
+        await self.coordinator.async_command(
+            self._zont.switch_button(
+                device=self._device,
+                button=self._toggle_button,
+                command=command
+            ),
+            PendingValue(
+                'toggle_buttons', self._device.id, self._toggle_button.id,
+                'active', command
+            )
+        )
+
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        await self._zont.switch_button(
-            device=self._device,
-            button=self._toggle_button,
-            command=True
-        )
-        self._toggle_button.active = True
-        self.async_write_ha_state()
+        await self._async_switch(True)
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        await self._zont.switch_button(
-            device=self._device,
-            button=self._toggle_button,
-            command=False
-        )
-        self._toggle_button.active = False
-        self.async_write_ha_state()
+        await self._async_switch(False)
 
     async def async_toggle(self, **kwargs):
         """Toggle the entity."""
@@ -100,6 +103,9 @@ class ZontSwitch(CoordinatorEntity, SwitchEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Обработка обновлённых данных от координатора"""
+        if not self.coordinator.is_changed(
+                self._device.id, self._toggle_button.id):
+            return
         toggle_button: ToggleButtonsZONT = self.coordinator.zont.get_toggle_button(
             device_id=self._device.id, toggle_button_id=self._toggle_button.id
         )
@@ -0,0 +1,43 @@
+from homeassistant.const import (
+    UnitOfTemperature, UnitOfElectricPotential, PERCENTAGE, UnitOfPressure,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfVolumeFlowRate, UnitOfSpeed,
+    UnitOfVolume, UnitOfFrequency, UnitOfPower, UnitOfApparentPower,
+    UnitOfReactivePower, CONCENTRATION_PARTS_PER_MILLION, UnitOfEnergy
+)
+
+UNIT_BY_TYPE = {
+    'temperature': UnitOfTemperature.CELSIUS,
+    'humidity': PERCENTAGE,
+    'voltage': UnitOfElectricPotential.VOLT,
+    'modulation': PERCENTAGE,
+    'pressure': UnitOfPressure.BAR,
+    'leakage': UnitOfElectricPotential.VOLT,
+    'motion': UnitOfElectricPotential.VOLT,
+    'smoke': UnitOfElectricPotential.VOLT,
+    'opening': UnitOfElectricPotential.VOLT,
+    'room_thermostat': UnitOfElectricPotential.VOLT,
+    'power_source': UnitOfEnergy.KILO_WATT_HOUR,
+    'discrete': UnitOfElectricPotential.VOLT,
+    'signal_strength': SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    'battery': PERCENTAGE
+}
+
+VALID_UNITS = {
+    'л/мин': UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+    'л': UnitOfVolume.LITERS,
+    'м³/ч': UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
+    'txt': None,
+    'дБм': SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    'бар': UnitOfPressure.BAR,
+    '°': UnitOfTemperature.CELSIUS,
+    '%': PERCENTAGE,
+    'В': UnitOfElectricPotential.VOLT,
+    'км/ч': UnitOfSpeed.KILOMETERS_PER_HOUR,
+    'Гц': UnitOfFrequency.HERTZ,
+    'Вт': UnitOfPower.WATT,
+    'ВА': UnitOfApparentPower.VOLT_AMPERE,
+    'ВАР': UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
+    'кВт•ч': UnitOfEnergy.KILO_WATT_HOUR,
+    'ppm': CONCENTRATION_PARTS_PER_MILLION,
+    'battery': PERCENTAGE
+}
@@ -0,0 +1,20 @@
+"""
+Тесты запускаются из корня репозитория. Без установленного Home
+Assistant пакет интеграции подключается без __init__.py, чтобы модули
+core, не зависящие от HA, можно было проверить отдельно.
+"""
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = 'custom_components.zont_ha'
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+if importlib.util.find_spec('homeassistant') is None:
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT / 'custom_components' / 'zont_ha')]
+    sys.modules[PACKAGE] = package
@@ -0,0 +1,77 @@
+"""Предохранитель запросов: размыкание, пробный запрос, замыкание."""
+from custom_components.zont_ha.core.breaker import (
+    CircuitBreaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+)
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker(threshold=2, open_time=60)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert 0 < breaker.retry_in <= 60
+
+
+def test_single_probe_when_half_open():
+    breaker = CircuitBreaker(threshold=1, open_time=0)
+    breaker.record_failure()
+
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow()
+    assert breaker.probing
+    assert not breaker.allow()
+    assert breaker.probes == 1
+
+
+def test_probe_success_closes():
+    breaker = CircuitBreaker(threshold=1, open_time=0)
+    breaker.record_failure()
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == STATE_CLOSED
+    assert not breaker.probing
+    assert breaker.failures == 0
+
+
+def test_probe_failure_doubles_open_time():
+    breaker = CircuitBreaker(threshold=1, open_time=60, max_open_time=100)
+    breaker.record_failure()
+    breaker._open_until = 0
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == STATE_OPEN
+    assert not breaker.probing
+    assert 60 < breaker.retry_in <= 100
+
+
+def test_shared_request_failure_counted_once():
+    breaker = CircuitBreaker(threshold=2)
+
+    assert breaker.record_failure(1)
+    assert not breaker.record_failure(1)
+
+    assert breaker.failures == 1
+    assert breaker.state == STATE_CLOSED
+
+
+def test_probe_failure_of_counted_request_reopens():
+    breaker = CircuitBreaker(threshold=1, open_time=0)
+    breaker.record_failure(1)
+    assert breaker.allow()
+
+    # Пробный опрос присоединился к уже учтённому неудачному запросу.
+    assert breaker.record_failure(1)
+
+    assert breaker.opened == 2
+    assert not breaker.probing
+    assert breaker.allow()
+    assert breaker.probes == 2
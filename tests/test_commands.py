@@ -0,0 +1,88 @@
+"""Очередь команд: схлопывание по ключу и отправка без ключа сразу."""
+import asyncio
+
+import pytest
+
+from custom_components.zont_ha.core.commands import CommandQueue
+
+DEVICE_ID = 100000
+
+
+def make_send(sent: list, value):
+    async def send():
+        sent.append(value)
+        return value
+    return send
+
+
+def test_same_key_coalesced():
+    async def run():
+        queue = CommandQueue(delay=0.01)
+        sent = []
+        key = (DEVICE_ID, 'temperature', 1000)
+        results = await asyncio.gather(*(
+            queue.submit(DEVICE_ID, key, make_send(sent, value))
+            for value in (20, 21, 22)
+        ))
+        return queue, sent, results
+
+    queue, sent, results = asyncio.run(run())
+
+    assert sent == [22]
+    assert results == [22, 22, 22]
+    assert (queue.submitted, queue.coalesced, queue.sent) == (3, 2, 1)
+
+
+def test_without_key_sent_immediately():
+    async def run():
+        queue = CommandQueue(delay=10)
+        sent = []
+        results = await asyncio.wait_for(asyncio.gather(
+            queue.submit(DEVICE_ID, None, make_send(sent, 'a')),
+            queue.submit(DEVICE_ID, None, make_send(sent, 'b')),
+        ), 1)
+        return queue, sent, results
+
+    queue, sent, results = asyncio.run(run())
+
+    assert sent == ['a', 'b']
+    assert results == ['a', 'b']
+    assert queue.coalesced == 0
+
+
+def test_limit_per_device():
+    async def run():
+        queue = CommandQueue(delay=0, limit=1)
+        running = 0
+        peak = 0
+
+        async def send():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(
+            queue.submit(DEVICE_ID, None, send) for _ in range(3)
+        ))
+        return peak
+
+    assert asyncio.run(run()) == 1
+
+
+def test_error_propagates():
+    async def run():
+        queue = CommandQueue(delay=0)
+
+        async def send():
+            raise RuntimeError('command')
+
+        with pytest.raises(RuntimeError):
+            await queue.submit(DEVICE_ID, (DEVICE_ID, 'guard', 1), send)
+        return queue
+
+    queue = asyncio.run(run())
+
+    assert queue.failed == 1
+    assert queue.as_dict()['waiting'] == 0
@@ -0,0 +1,72 @@
+"""Декодер ответа API V3: выбор устройств и переиспользование моделей."""
+import json
+
+import pytest
+
+from benchmarks.payloads import make_account
+from custom_components.zont_ha.core.decode import (
+    AccountDecoder, decode_account
+)
+
+DEVICE_ID = 100000
+
+
+def encode(account: dict) -> bytes:
+    return json.dumps(account).encode()
+
+
+def test_decode_account_selected_devices():
+    body = encode(make_account(devices=3, sensors=2))
+
+    account = decode_account(body, {str(DEVICE_ID + 1)})
+
+    assert account.ok is True
+    assert [device.id for device in account.devices] == [DEVICE_ID + 1]
+    assert len(decode_account(body).devices) == 3
+
+
+def test_decode_account_not_object():
+    with pytest.raises(ValueError):
+        decode_account(b'[]')
+
+
+def test_decoder_reuses_unchanged_devices():
+    data = make_account(devices=2, sensors=2)
+    decoder = AccountDecoder()
+    first, fresh = decoder.decode(encode(data))
+    assert len(fresh) == 2
+
+    data['devices'][1]['online'] = False
+    second, fresh = decoder.decode(encode(data))
+
+    assert second.devices[0] is first.devices[0]
+    assert [device.id for device in fresh] == [DEVICE_ID + 1]
+    assert second.devices[1].online is False
+    assert (decoder.validated, decoder.reused) == (3, 1)
+
+
+def test_decoder_invalidate_device():
+    body = encode(make_account(devices=2, sensors=2))
+    decoder = AccountDecoder()
+    first, _ = decoder.decode(body)
+
+    decoder.invalidate(DEVICE_ID)
+    second, fresh = decoder.decode(body)
+
+    assert [device.id for device in fresh] == [DEVICE_ID]
+    assert second.devices[0] is not first.devices[0]
+    assert second.devices[1] is first.devices[1]
+
+
+def test_decoder_drops_devices_invalidated_during_parse():
+    body = encode(make_account(devices=2, sensors=2))
+    decoder = AccountDecoder()
+    decoder.decode(body)
+
+    result = decoder.parse(body)
+    decoder.invalidate(DEVICE_ID)
+    decoder.commit(result)
+
+    assert len(decoder) == 1
+    _, fresh = decoder.decode(body)
+    assert [device.id for device in fresh] == [DEVICE_ID]
@@ -0,0 +1,74 @@
+"""Сравнение снимков аккаунта: ChangeSet по устройствам и объектам."""
+import copy
+import json
+
+from benchmarks.payloads import make_account
+from custom_components.zont_ha.core.decode import decode_account
+from custom_components.zont_ha.core.delta import ChangeSet, diff_account
+
+DEVICE_ID = 100000
+
+
+def decode(account: dict):
+    return decode_account(json.dumps(account).encode())
+
+
+def test_no_previous_snapshot():
+    assert diff_account(None, decode(make_account(devices=1))) is None
+
+
+def test_unchanged_account():
+    data = make_account(devices=2, sensors=2)
+
+    changes = diff_account(decode(data), decode(copy.deepcopy(data)))
+
+    assert not changes
+    assert len(changes) == 0
+
+
+def test_changed_sensor_and_device():
+    data = make_account(devices=2, sensors=2)
+    new = copy.deepcopy(data)
+    new['devices'][0]['sensors'][1]['value'] = 30.0
+    new['devices'][1]['online'] = False
+
+    changes = diff_account(decode(data), decode(new))
+
+    assert changes.objects == {(DEVICE_ID, 3001)}
+    assert changes.devices == {DEVICE_ID + 1}
+    assert changes.is_changed(DEVICE_ID, 3001)
+    assert not changes.is_changed(DEVICE_ID, 3000)
+    assert changes.is_changed(DEVICE_ID + 1, 3000)
+
+
+def test_added_and_removed_devices():
+    old = decode(make_account(devices=2, sensors=1))
+    data = make_account(devices=2, sensors=1)
+    data['devices'][1]['id'] = DEVICE_ID + 5
+
+    changes = diff_account(old, decode(data))
+
+    assert changes.devices == {DEVICE_ID + 1, DEVICE_ID + 5}
+
+
+def test_changed_modes_mark_circuits():
+    data = make_account(devices=1, sensors=1)
+    new = copy.deepcopy(data)
+    new['devices'][0]['modes'][0]['name'] = 'Ночь'
+
+    changes = diff_account(decode(data), decode(new))
+
+    circuits = {(DEVICE_ID, 1000 + i) for i in range(4)}
+    assert changes.objects == {(DEVICE_ID, 2000)} | circuits
+
+
+def test_changeset_update():
+    changes = ChangeSet()
+    other = ChangeSet()
+    other.add_device(1)
+    other.add_object(2, 'a')
+
+    changes.update(other)
+
+    assert changes.devices == {1}
+    assert changes.objects == {(2, 'a')}
@@ -0,0 +1,57 @@
+"""Очередь webhook: события окна объединяются в одно обновление."""
+import asyncio
+
+from custom_components.zont_ha.core.events import WebhookCoalescer
+from custom_components.zont_ha.core.models_zont_webhook import (
+    DeviceEventWebhook
+)
+
+
+def make_event(device_id: int = 100000) -> DeviceEventWebhook:
+    return DeviceEventWebhook.model_construct(
+        device_id=device_id, type='control_on'
+    )
+
+
+def test_events_in_window_merged():
+    async def run():
+        refreshes = 0
+
+        async def refresh():
+            nonlocal refreshes
+            refreshes += 1
+
+        coalescer = WebhookCoalescer(refresh, window=0.01)
+        for _ in range(3):
+            coalescer.push(make_event())
+        coalescer.drop()
+        await asyncio.sleep(0.05)
+        return coalescer, refreshes
+
+    coalescer, refreshes = asyncio.run(run())
+
+    assert refreshes == 1
+    assert coalescer.as_dict() == {
+        'window': 0.01, 'received': 4, 'merged': 2, 'dropped': 1,
+        'refreshes': 1, 'pending': 0,
+    }
+
+
+def test_cancel_pending():
+    async def run():
+        refreshes = 0
+
+        async def refresh():
+            nonlocal refreshes
+            refreshes += 1
+
+        coalescer = WebhookCoalescer(refresh, window=0.01)
+        coalescer.push(make_event())
+        coalescer.cancel()
+        await asyncio.sleep(0.05)
+        return coalescer, refreshes
+
+    coalescer, refreshes = asyncio.run(run())
+
+    assert refreshes == 0
+    assert coalescer.as_dict()['pending'] == 0
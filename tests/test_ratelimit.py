@@ -0,0 +1,74 @@
+"""Ограничитель частоты запросов: burst, приоритеты, пауза по 429."""
+import asyncio
+
+from custom_components.zont_ha.core.ratelimit import (
+    TokenBucket, get_retry_after, PRIORITY_COMMAND, PRIORITY_BACKGROUND
+)
+
+
+class Response:
+    def __init__(self, retry_after: str | None) -> None:
+        self.headers = {}
+        if retry_after is not None:
+            self.headers['Retry-After'] = retry_after
+
+
+def test_burst_without_waiting():
+    async def run():
+        bucket = TokenBucket(rate=1, capacity=3)
+        waits = [await bucket.acquire() for _ in range(3)]
+        return bucket, waits
+
+    bucket, waits = asyncio.run(run())
+
+    assert waits == [0, 0, 0]
+    assert bucket.delayed == 0
+
+
+def test_commands_served_before_background():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+        order = []
+
+        async def request(priority, name):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        await asyncio.gather(
+            request(PRIORITY_BACKGROUND, 'background'),
+            request(PRIORITY_COMMAND, 'command'),
+        )
+        return bucket, order
+
+    bucket, order = asyncio.run(run())
+
+    assert order == ['command', 'background']
+    assert bucket.delayed == 2
+    assert bucket.max_queue_depth == 2
+
+
+def test_pause():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=5)
+        bucket.pause(0.05)
+        paused_for = bucket.paused_for
+        waited = await bucket.acquire()
+        return bucket, paused_for, waited
+
+    bucket, paused_for, waited = asyncio.run(run())
+
+    assert 0 < paused_for <= 0.05
+    assert waited >= 0.04
+    assert bucket.paused == 1
+    assert bucket.paused_for == 0
+
+
+def test_retry_after():
+    assert get_retry_after(Response('7')) == 7
+    assert get_retry_after(Response('-1')) == 0
+    assert get_retry_after(Response(None)) is None
+    assert get_retry_after(Response('soon')) is None
+    assert get_retry_after(
+        Response('Wed, 21 Oct 2015 07:28:00 GMT')
+    ) == 0
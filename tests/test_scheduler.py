@@ -0,0 +1,55 @@
+"""Адаптивный интервал опроса."""
+from custom_components.zont_ha.core.scheduler import PollScheduler
+
+
+def test_base_interval():
+    scheduler = PollScheduler(min_interval=15, max_interval=300)
+
+    assert scheduler.next_interval() == 60
+    assert scheduler.reason == 'base'
+
+
+def test_error_backoff_with_jitter():
+    scheduler = PollScheduler(min_interval=15, max_interval=300)
+    for _ in range(3):
+        scheduler.record_error()
+
+    interval = scheduler.next_interval()
+
+    assert scheduler.reason == 'error'
+    assert 240 * 0.8 <= interval <= 240
+    for _ in range(3):
+        scheduler.record_error()
+    assert scheduler.next_interval() <= 300
+    scheduler.record_success(changed=True)
+    assert scheduler.next_interval() == 60
+
+
+def test_boost_and_transition():
+    transition = False
+    scheduler = PollScheduler(
+        min_interval=15, max_interval=300,
+        in_transition=lambda: transition
+    )
+    scheduler.boost(60)
+    assert scheduler.next_interval() == 15
+    assert scheduler.reason == 'boost'
+
+    scheduler._boost_until = 0
+    assert scheduler.next_interval() == 60
+    transition = True
+    assert scheduler.next_interval() == 15
+
+
+def test_stable_polls_with_webhooks():
+    scheduler = PollScheduler(min_interval=15, max_interval=300)
+    for _ in range(3):
+        scheduler.record_success(changed=False)
+    assert scheduler.next_interval() == 60
+
+    scheduler.record_webhook()
+    assert scheduler.next_interval() == 120
+    assert scheduler.reason == 'stable'
+    for _ in range(5):
+        scheduler.record_success(changed=False)
+    assert scheduler.next_interval() == 300
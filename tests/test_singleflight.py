@@ -0,0 +1,62 @@
+"""Один запрос данных в полёте и повторный запрос после mark_stale."""
+import asyncio
+
+import pytest
+
+from custom_components.zont_ha.core.singleflight import SingleFlight
+
+
+class Fetch:
+    """Запрос, завершающийся по событию release."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> None:
+        self.calls += 1
+        await self.release.wait()
+
+
+async def run_concurrent(stale: bool) -> tuple[Fetch, SingleFlight]:
+    fetch = Fetch()
+    flight = SingleFlight(fetch, timeout=5)
+    first = asyncio.ensure_future(flight.run())
+    await asyncio.sleep(0)
+    if stale:
+        flight.mark_stale()
+    others = [asyncio.ensure_future(flight.run()) for _ in range(3)]
+    await asyncio.sleep(0)
+    fetch.release.set()
+    await asyncio.gather(first, *others)
+    return fetch, flight
+
+
+def test_concurrent_calls_share_fetch():
+    fetch, flight = asyncio.run(run_concurrent(stale=False))
+
+    assert fetch.calls == 1
+    assert flight.fetches == 1
+    assert flight.attached == 3
+    assert flight.deduplicated == 3
+
+
+def test_stale_data_schedules_one_follow_up():
+    fetch, flight = asyncio.run(run_concurrent(stale=True))
+
+    assert fetch.calls == 2
+    assert flight.follow_ups == 1
+    assert flight.attached == 2
+
+
+def test_timeout_and_error_propagate():
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def broken():
+        raise RuntimeError('fetch')
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(SingleFlight(slow, timeout=0.01).run())
+    with pytest.raises(RuntimeError):
+        asyncio.run(SingleFlight(broken, timeout=1).run())
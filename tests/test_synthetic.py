@@ -0,0 +1,99 @@
+"""
+Производные сенсоры радиодатчиков (батарея, уровень сигнала): id
+и объекты сохраняются между опросами, меняются только значения.
+"""
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('homeassistant')
+
+from custom_components.zont_ha.core.zont import Zont  # noqa: E402
+
+DEVICE_ID = 100000
+SENSOR_ID = 3000
+
+
+class PayloadResponse:
+    def __init__(self, body: bytes) -> None:
+        self.status = 200
+        self.headers = {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class PayloadSession:
+    """Сессия, отдающая заданный ответ V3 без сети."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    async def request(self, method: str, **kwargs) -> PayloadResponse:
+        return PayloadResponse(self.body)
+
+
+def make_body(battery: int) -> bytes:
+    """Ответ V3: контроллер с одним радиодатчиком температуры."""
+    return json.dumps({
+        'ok': True,
+        'devices': [{
+            'id': DEVICE_ID,
+            'name': 'Контроллер',
+            'online': True,
+            'device_info': {
+                'id': str(DEVICE_ID),
+                'model': 'H2000+ PRO',
+                'serial': 'SN00100000',
+                'widget_type': 'heating',
+                'version': {'hardware': '1.0', 'software': '2.0'},
+            },
+            'circuits': [],
+            'modes': [],
+            'sensors': [{
+                'id': SENSOR_ID,
+                'name': 'Спальня',
+                'type': 'temperature',
+                'status': 'ok',
+                'value': 21.5,
+                'unit': '°',
+                'battery': battery,
+                'rssi': -70.0,
+            }],
+            'guard_zones': [],
+            'controls': {'statuses': [], 'toggle_buttons': []},
+        }],
+    }).encode()
+
+
+async def poll_twice(first: bytes, second: bytes):
+    zont = Zont(None, 'test@example.com', 'token',
+                session=PayloadSession(first), executor_threshold=2 ** 62)
+    await zont.get_update()
+    before = {
+        sensor.id: sensor for sensor in zont.get_device(DEVICE_ID).sensors
+    }
+    zont.session.body = second
+    zont.mark_stale()
+    await zont.get_update()
+    after = {
+        sensor.id: sensor for sensor in zont.get_device(DEVICE_ID).sensors
+    }
+    return zont, before, after
+
+
+def test_synthetic_sensors_keep_ids_and_objects():
+    zont, before, after = asyncio.run(
+        poll_twice(make_body(90), make_body(80))
+    )
+    battery_id = f'{SENSOR_ID}_battery'
+    rssi_id = f'{SENSOR_ID}_rssi'
+
+    assert before.keys() == after.keys() == {SENSOR_ID, battery_id, rssi_id}
+    assert after[battery_id] is before[battery_id]
+    assert after[rssi_id] is before[rssi_id]
+    assert after[battery_id].value == 80
+    assert (DEVICE_ID, battery_id) in zont.changes.objects
+    assert (DEVICE_ID, rssi_id) not in zont.changes.objects
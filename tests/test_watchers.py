@@ -0,0 +1,34 @@
+"""Цикл ускоренного опроса охранных зон."""
+import asyncio
+
+from custom_components.zont_ha.core import watchers
+from custom_components.zont_ha.core.watchers import GuardTransitionWatcher
+
+
+def test_loop_started_by_create_task(monkeypatch):
+    monkeypatch.setattr(watchers, 'TIME_OUT_REQUEST', 0)
+
+    async def run():
+        refreshes = 0
+        tasks = []
+
+        async def refresh():
+            nonlocal refreshes
+            refreshes += 1
+
+        def create_task(coro):
+            task = asyncio.ensure_future(coro)
+            tasks.append(task)
+            return task
+
+        watcher = GuardTransitionWatcher(refresh, lambda: False, create_task)
+        watcher.start()
+        watcher.start(reset=True)
+        await tasks[0]
+        return watcher, tasks, refreshes
+
+    watcher, tasks, refreshes = asyncio.run(run())
+
+    assert len(tasks) == 1
+    assert refreshes == 2
+    assert not watcher.active